@@ -0,0 +1,134 @@
+r"""Benchmarks
+==============
+
+Run all benchmarks by ``python -m benchmarks``.
+
+Every call is timed separately to report the median and the 99th
+percentile latency. Then the calls are repeated under ``tracemalloc`` to
+report the median of the peak memory allocated by one call.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from statistics import median_low, quantiles
+from time import perf_counter_ns
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+
+
+@dataclass
+class Result:
+    r"""Result."""
+
+    name: str
+    times: list[int]
+    size: int
+
+    def __str__(self) -> str:
+        r"""Str.
+
+        :rtype: str
+        """
+        percentiles = quantiles(self.times, n=100)
+        return (
+            f"{self.name}: p50 {percentiles[49]:.0f} ns, "
+            f"p99 {percentiles[98]:.0f} ns, {self.size} B"
+        )
+
+
+def time(func: Callable[[], object], number: int) -> list[int]:
+    r"""Time every call of ``func``.
+
+    :param func:
+    :type func: Callable[[], object]
+    :param number:
+    :type number: int
+    :rtype: list[int]
+    """
+    times = []
+    for _ in range(number):
+        begin = perf_counter_ns()
+        func()
+        times += [perf_counter_ns() - begin]
+    return times
+
+
+# the cost of timing itself
+OVERHEAD = min(time(lambda: None, 10000))
+
+
+def measure(name: str, func: Callable[[], object], number: int) -> Result:
+    r"""Measure the latency and the allocated memory of calling ``func``.
+
+    :param name:
+    :type name: str
+    :param func:
+    :type func: Callable[[], object]
+    :param number:
+    :type number: int
+    :rtype: Result
+    """
+    # warm up caches
+    time(func, number // 10)
+    times = [max(t - OVERHEAD, 0) for t in time(func, number)]
+    sizes = []
+    start()
+    for _ in range(min(number, 1000)):
+        current, _ = get_traced_memory()
+        reset_peak()
+        func()
+        _, peak = get_traced_memory()
+        sizes += [peak - current]
+    stop()
+    return Result(name, times, median_low(sizes))
+
+
+@dataclass
+class Size:
+    r"""Size."""
+
+    name: str
+    number: int
+    size: int
+
+    def __str__(self) -> str:
+        r"""Str.
+
+        :rtype: str
+        """
+        return f"{self.name}: {self.size / self.number:.0f} B"
+
+
+def measure_size(name: str, func: Callable[[], object], number: int) -> Size:
+    r"""Measure the memory kept by the results of calling ``func`` ``number``
+    times.
+
+    :param name:
+    :type name: str
+    :param func:
+    :type func: Callable[[], object]
+    :param number:
+    :type number: int
+    :rtype: Size
+    """
+    start()
+    results = [func() for _ in range(number)]
+    size, _ = get_traced_memory()
+    stop()
+    del results
+    return Size(name, number, size)
+
+
+@dataclass
+class Count:
+    r"""Count."""
+
+    name: str
+    number: int
+    count: int
+
+    def __str__(self) -> str:
+        r"""Str.
+
+        :rtype: str
+        """
+        return f"{self.name}: {self.count / self.number:.1f} per call"
@@ -0,0 +1,10 @@
+r"""This module can be called by
+`python -m <https://docs.python.org/3/library/__main__.html>`_.
+"""
+
+from . import api, ime, keystroke, nvim, server, width
+
+if __name__ == "__main__":
+    for module in (api, ime, keystroke, nvim, server, width):
+        for result in module.run():
+            print(result)
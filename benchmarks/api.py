@@ -0,0 +1,93 @@
+r"""API
+=======
+
+Per-call overhead of ``API.process_key()``. An unhandled key without
+composition returns from librime immediately, so the time is dominated by
+the binding.
+
+``Session.process_keys()`` processes 50 keys in one call.
+``Session.simulate()`` doesn't parse ``Key``s.
+``Session.get_context_view()`` only decodes the accessed fields.
+"""
+
+from array import array
+from collections.abc import Iterator
+
+from pyrime.key import Key
+from pyrime.rime import RimeBase
+
+from . import Result, measure
+from .session import FakeSession, get_session
+
+
+def run() -> Iterator[Result]:
+    r"""Run.
+
+    :rtype: Iterator[Result]
+    """
+    session = get_session()
+    if isinstance(session, FakeSession):
+        return
+    api = session.api  # type: ignore
+    session_id = session.id  # type: ignore
+    keycode, mask = Key.new("<esc>")
+    yield measure(
+        "API.process_key",
+        lambda: api.process_key(session_id, keycode, mask),
+        100000,
+    )
+    yield measure(
+        "Session.process_key",
+        lambda: session.process_key(keycode, mask),
+        100000,
+    )
+    keycodes = array("i", map(ord, "nihao" * 10))
+    masks = array("i", [0] * len(keycodes))
+    yield measure(
+        "Session.process_keys x50",
+        lambda: (
+            session.process_keys(keycodes, masks),
+            session.clear_composition(),
+        ),
+        1000,
+    )
+    yield measure(
+        "Session.process_key x50",
+        lambda: (
+            [session.process_key(keycode, 0) for keycode in keycodes],
+            session.clear_composition(),
+        ),
+        1000,
+    )
+    text = "nihao" * 10
+    yield measure(
+        "Session.simulate x50",
+        lambda: (session.simulate(text), session.clear_composition()),
+        1000,
+    )
+    session.process_key(ord("n"), 0)
+    yield measure(
+        "Session.get_context",
+        lambda: session.get_context().menu.num_candidates,  # type: ignore
+        10000,
+    )
+
+    def get_context_view() -> int:
+        r"""Get context view.
+
+        :rtype: int
+        """
+        with session.get_context_view() as context:
+            return context.menu.num_candidates  # type: ignore
+
+    yield measure("Session.get_context_view", get_context_view, 10000)
+    session.clear_composition()
+    rime = RimeBase(session)
+    yield measure(
+        "RimeBase.draw x50",
+        lambda: (
+            rime.draw(*map(Key.new, text)),
+            session.clear_composition(),
+        ),
+        1000,
+    )
@@ -0,0 +1,50 @@
+r"""IME
+=======
+
+Time and memory of a menu of 10 candidates. ``list[Candidate]`` creates one
+object per candidate, while ``Candidates`` stores texts and comments in two
+tuples.
+"""
+
+from collections.abc import Iterator
+
+from pyrime.ime import Candidate, Candidates, Composition, Context, Menu
+
+from . import Result, Size, measure, measure_size
+
+TEXTS = tuple("我为玩问无万完网王外")
+COMMENTS = (None,) * len(TEXTS)
+
+
+def get_context(candidates: list[Candidate] | Candidates) -> Context:
+    r"""Get context.
+
+    :param candidates:
+    :type candidates: list[Candidate] | Candidates
+    :rtype: Context
+    """
+    return Context(
+        Composition(1, 1, 0, 1, "w"),
+        Menu(10, 0, False, 0, len(candidates), None, candidates),
+    )
+
+
+def run() -> Iterator[Result | Size]:
+    r"""Run.
+
+    :rtype: Iterator[Result | Size]
+    """
+    for name, func in (
+        (
+            "Context list[Candidate]",
+            lambda: get_context(list(map(Candidate, TEXTS, COMMENTS))),
+        ),
+        (
+            "Context Candidates",
+            lambda: get_context(
+                Candidates(tuple([*TEXTS]), tuple([*COMMENTS]))
+            ),
+        ),
+    ):
+        yield measure(name, func, 100000)
+        yield measure_size(name, func, 10000)
@@ -0,0 +1,335 @@
+r"""Keystroke
+=============
+
+Latency of every step from a keystroke to the screen. Keystrokes cycle
+through ``"nihao "``, so every call processes one key with a realistic
+composition.
+
+The last benchmarks feed keys to a headless prompt toolkit application
+with the key bindings of ``load_rime_bindings()``. A slow engine blocks
+the event loop for every key unless keys are processed by a ``Worker``.
+"""
+
+import asyncio
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from itertools import cycle
+from time import sleep
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.application.current import create_app_session, set_app
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.document import Document
+from prompt_toolkit.filters.base import Condition
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.key_binding.key_processor import KeyPress
+from prompt_toolkit.keys import Keys
+from prompt_toolkit.layout.containers import Window
+from prompt_toolkit.layout.controls import BufferControl
+from prompt_toolkit.layout.layout import Layout
+from prompt_toolkit.output import DummyOutput
+
+from pyrime.ime.ui.horizontal import HorizontalUI
+from pyrime.ime.ui.vertical import VerticalUI
+from pyrime.key import Key
+from pyrime.ptpython.bindings.rime import load_rime_bindings, pt_key_name
+from pyrime.ptpython.ime import IME
+from pyrime.ptpython.layout import RimeLayout
+from pyrime.rime import LazySession
+from pyrime.utils import SessionBase
+from pyrime.worker import Worker
+
+from . import Count, Result, measure
+from .session import FakeSession, get_session
+
+TEXT = "nihao "
+
+
+@dataclass
+class SlowSession(FakeSession):
+    r"""A fake session taking ``delay`` seconds to process a key."""
+
+    delay: float = 0.001
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param self:
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        sleep(self.delay)
+        return super().process_key(keycode, mask)
+
+
+def cycled(func: Callable[[str], object], text: str = TEXT) -> Callable:
+    r"""Call ``func`` with the next character of ``text`` every time.
+
+    :param func:
+    :type func: Callable[[str], object]
+    :param text:
+    :type text: str
+    :rtype: Callable
+    """
+    chars = cycle(text)
+    return lambda: func(next(chars))
+
+
+@contextmanager
+def create_ime(
+    session: SessionBase, worker: Worker | None = None
+) -> Generator[IME, None, None]:
+    r"""Create an IME in a headless application.
+
+    :param session:
+    :type session: SessionBase
+    :param worker:
+    :type worker: Worker | None
+    :rtype: Generator[IME, None, None]
+    """
+    with (
+        create_pipe_input() as input,
+        create_app_session(input=input, output=DummyOutput()),
+    ):
+        app = Application(Layout(Window(BufferControl(Buffer()))))
+        # no event loop flushes the key buffer after a timeout
+        app.timeoutlen = None
+        with set_app(app):
+            ime = IME(RimeLayout(app), session=session, worker=worker)
+            ime.is_enabled = True
+            yield ime
+
+
+def render(app: Application) -> None:
+    r"""Render an application once.
+
+    Rendering loads history in an event loop.
+
+    :param app:
+    :type app: Application
+    :rtype: None
+    """
+
+    async def _() -> None:
+        r""".
+
+        :rtype: None
+        """
+        app.renderer.render(app, app.layout)
+
+    asyncio.run(_())
+
+
+def count_conditions(
+    name: str, func: Callable[[], object], number: int
+) -> Count:
+    r"""Count how many times ``Condition``s are evaluated.
+
+    :param name:
+    :type name: str
+    :param func:
+    :type func: Callable[[], object]
+    :param number:
+    :type number: int
+    :rtype: Count
+    """
+    count = 0
+    call = Condition.__call__
+
+    def counted_call(self: Condition) -> bool:
+        r"""Count a call.
+
+        :param self:
+        :type self: Condition
+        :rtype: bool
+        """
+        nonlocal count
+        count += 1
+        return call(self)
+
+    Condition.__call__ = counted_call
+    try:
+        for _ in range(number):
+            func()
+    finally:
+        Condition.__call__ = call
+    return Count(name, number, count)
+
+
+def feed(ime: IME, char: str) -> None:
+    r"""Feed a key to the application of ``ime``.
+
+    :param ime:
+    :type ime: IME
+    :param char:
+    :type char: str
+    :rtype: None
+    """
+    # don't let committed text grow
+    if char == TEXT[0]:
+        ime.app.current_buffer.text = ""
+    ime.app.key_processor.feed(KeyPress(char, char))
+    ime.app.key_processor.process_keys()
+
+
+async def measure_feed(name: str, ime: IME, number: int) -> Result:
+    r"""Measure feeding keys in an event loop, then wait for the worker.
+
+    :param name:
+    :type name: str
+    :param ime:
+    :type ime: IME
+    :param number:
+    :type number: int
+    :rtype: Result
+    """
+    result = measure(name, cycled(partial(feed, ime)), number)
+    while ime.is_busy:
+        await asyncio.sleep(0.01)
+    return result
+
+
+def run() -> Iterator[Result | Count]:
+    r"""Run.
+
+    :rtype: Iterator[Result | Count]
+    """
+    yield measure("Key.new", cycled(Key.new), 10000)
+    yield measure("Key.new <c-x>", lambda: Key.new("<c-x>"), 10000)
+    yield measure("pt_key_name", cycled(lambda c: pt_key_name((c,))), 10000)
+    yield measure(
+        "pt_key_name <a-c-x>",
+        lambda: pt_key_name((Keys.Escape, Keys.ControlX)),
+        10000,
+    )
+
+    session = get_session()
+    keys = tuple(Key.new(char) for char in TEXT)
+    yield measure(
+        f"{type(session).__name__}.process_key",
+        cycled(lambda c: session.process_key(ord(c), 0)),
+        10000,
+    )
+    session.clear_composition()
+    session.process_key(ord("n"), 0)
+    yield measure(
+        f"{type(session).__name__}.get_context", session.get_context, 10000
+    )
+
+    context = session.get_context()
+    if context:
+        for ui in HorizontalUI(), VerticalUI():
+            yield measure(
+                f"{type(ui).__name__}.draw",
+                lambda ui=ui: ui.draw(context),
+                10000,
+            )
+            yield measure(
+                f"{type(ui).__name__}.render",
+                lambda ui=ui: ui.render(context),
+                10000,
+            )
+
+    with create_ime(session) as ime:
+        session.clear_composition()
+        _, lines, col = ime.draw(keys[0])
+        layout = ime.layout
+
+        def update() -> None:
+            r"""Update layout without skipping.
+
+            :rtype: None
+            """
+            layout.last = None
+            layout.update(lines, col)
+
+        yield measure("RimeLayout.update", update, 10000)
+        yield measure(
+            "RimeLayout.update skipped",
+            lambda: layout.update(lines, col),
+            10000,
+        )
+        buffer = ime.app.current_buffer
+        # the cost shouldn't grow with the text before cursor
+        for number in 10, 1000, 100000:
+            buffer.document = Document("print('你好')\n" * number)
+            render(ime.app)
+            yield measure(f"RimeLayout.update {number} lines", update, 1000)
+        buffer.text = ""
+        layout.updated = layout.skipped = 0
+        layout.get_input_prompt = lambda: [
+            ("class:in", "In ["),
+            ("class:in.number", "1"),
+            ("class:in", "]: "),
+        ]
+        yield measure(
+            "RimeLayout.get_prompt_width", layout.get_prompt_width, 10000
+        )
+        layout.get_prompt_key = lambda: 1
+        yield measure(
+            "RimeLayout.get_prompt_width cached",
+            layout.get_prompt_width,
+            10000,
+        )
+        layout.get_input_prompt, layout.get_prompt_key = lambda: "", None
+        session.clear_composition()
+        key_processor = ime.app.key_processor
+        yield measure("load_rime_bindings", cycled(partial(feed, ime)), 10000)
+        yield count_conditions("Condition", cycled(partial(feed, ime)), 600)
+        ui = ime.ui
+        # keys cycle, so most of contexts have been rendered
+        yield Count("UI.render hits", ui.hits + ui.misses, ui.hits)
+        yield Count(
+            "RimeLayout.update skipped",
+            layout.updated + layout.skipped,
+            layout.skipped,
+        )
+        feed(ime, "n")
+
+        def feed_alt() -> None:
+            r"""Feed ``<a-x>`` when preedit is available.
+
+            :rtype: None
+            """
+            key_processor.feed_multiple([
+                KeyPress(Keys.Escape, "\x1b"),
+                KeyPress("x", "x"),
+            ])
+            key_processor.process_keys()
+
+        yield measure("load_rime_bindings <a-x>", feed_alt, 1000)
+        yield count_conditions("Condition <a-x>", feed_alt, 100)
+        yield measure(
+            "load_rime_bindings startup", lambda: load_rime_bindings(ime), 20
+        )
+        session.clear_composition()
+        render(ime.app)
+
+        def toggle() -> None:
+            r"""Disable and enable rime, then render.
+
+            :rtype: None
+            """
+            for enabled in False, True:
+                ime.is_enabled = enabled
+                ime.app.renderer.render(ime.app, ime.app.layout)
+
+        yield measure("IME.is_enabled toggle", toggle, 200)
+
+        # before the first prompt, a lazy session is only constructed
+        yield measure("get_session", get_session, 20)
+        yield measure("LazySession", lambda: LazySession(get_session), 20)
+
+    for worker in None, Worker():
+        with create_ime(SlowSession(), worker) as ime:
+            name = "load_rime_bindings slow engine"
+            if worker:
+                name += " worker"
+            yield asyncio.run(measure_feed(name, ime, 200))
+        if worker:
+            worker.shutdown()
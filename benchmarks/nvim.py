@@ -0,0 +1,140 @@
+r"""Nvim
+========
+
+Requests sent to neovim when rime is toggled. ``Keymap`` sets or deletes
+all special and nowait keymaps by one request each. ``Win`` updates the
+floating window by one request per keystroke. ``Rime.is_enabled`` is
+checked for every key without any request.
+
+A fake API counts requests, so neovim isn't required. pynvim is.
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from . import Count, Result, measure
+
+
+@dataclass
+class Api:
+    r"""A fake ``RemoteApi`` counting requests."""
+
+    count: int = 0
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        r"""Get a request.
+
+        :param name:
+        :type name: str
+        :rtype: Callable[..., None]
+        """
+
+        def request(*args: object) -> None:
+            r"""Count a request.
+
+            :param args:
+            :type args: object
+            :rtype: None
+            """
+            self.count += 1
+
+        return request
+
+    def exec_lua(self, code: str, args: list) -> list:
+        r"""Count a request of Lua.
+
+        :param code:
+        :type code: str
+        :param args:
+        :type args: list
+        :return: the current buffer and enabled buffers for ``GET_BUFFERS``,
+            or no failed keymaps
+        :rtype: list
+        """
+        from pyrime.nvim.rime import GET_BUFFERS
+
+        self.count += 1
+        return [1, []] if code == GET_BUFFERS else []
+
+    def call_atomic(self, calls: list[list]) -> list:
+        r"""Count a request of many calls.
+
+        :param calls:
+        :type calls: list[list]
+        :rtype: list
+        """
+        self.count += 1
+        return [
+            [[] if name == "nvim_exec_lua" else 1 for name, _ in calls],
+            None,
+        ]
+
+
+@dataclass
+class Nvim:
+    r"""A fake ``Nvim``."""
+
+    api: Api = field(default_factory=Api)
+    channel_id: int = 1
+
+
+def run() -> Iterator[Result | Count]:
+    r"""Run.
+
+    :rtype: Iterator[Result | Count]
+    """
+    try:
+        from pyrime.nvim.keymap import Keymap
+        from pyrime.nvim.rime import Rime
+        from pyrime.nvim.win import Win
+    except ImportError:
+        return
+    api = Api()
+    keymap = Keymap(api)  # type: ignore
+
+    def toggle() -> None:
+        r"""Enable and disable keymaps.
+
+        :rtype: None
+        """
+        keymap.set_special(lambda lhs: f"<Cmd>Rime {lhs}<CR>")
+        keymap.set_nowait(True)
+        keymap.set_special(None)
+        keymap.set_nowait(False)
+
+    toggle()
+    yield Count("Keymap requests per toggle", 1, api.count)
+    yield measure("Keymap toggle", toggle, 1000)
+
+    api.count = 0
+    win = Win(api, channel_id=1)  # type: ignore
+    frames = [
+        ("n|", "1. 你 2. 呢"),
+        ("ni|", "1. 你 2. 呢"),
+        ("nih|", "1. 你好 2. 拟好"),
+        ("nihao|", "1. 你好 2. 拟好"),
+        (),
+    ]
+
+    def type_word() -> None:
+        r"""Update the window for every keystroke of a word.
+
+        :rtype: None
+        """
+        for lines in frames:
+            win.update(lines)
+
+    type_word()
+    api.count = 0
+    type_word()
+    yield Count("Win requests per keystroke", len(frames), api.count)
+    yield measure("Win update", type_word, 1000)
+
+    vim = Nvim(api)
+    rime = Rime(vim=vim)  # type: ignore
+    rime.is_enabled = True
+    rime.buf_enter(2)
+    api.count = 0
+    result = measure("Rime.is_enabled", lambda: rime.is_enabled, 10000)
+    yield Count("Rime.is_enabled requests", 10000, api.count)
+    yield result
@@ -0,0 +1,60 @@
+r"""Server
+==========
+
+Latency of a keystroke drawn by ``RimeBase`` with a local session and with
+a ``RemoteSession`` of a server in another thread. A remote keystroke
+takes one round trip.
+"""
+
+import os
+from collections.abc import Iterator
+from tempfile import TemporaryDirectory
+from threading import Thread
+
+from pyrime.client import RemoteSession
+from pyrime.key import Key
+from pyrime.rime import RimeBase
+from pyrime.server import Server
+
+from . import Count, Result, measure
+from .keystroke import TEXT, cycled
+from .session import get_session
+
+
+def run() -> Iterator[Result | Count]:
+    r"""Run.
+
+    :rtype: Iterator[Result | Count]
+    """
+    keys = {char: Key.new(char) for char in TEXT}
+    rime = RimeBase(get_session())
+    yield measure(
+        "RimeBase.draw local", cycled(lambda c: rime.draw(keys[c])), 10000
+    )
+    with TemporaryDirectory() as tempdir:
+        server = Server(os.path.join(tempdir, "pyrime.sock"), get_session)
+        socket_server = server.create_server()
+        thread = Thread(target=socket_server.serve_forever)
+        thread.start()
+        try:
+            session = RemoteSession(server.path)
+            rime = RimeBase(session)
+            yield measure(
+                "RimeBase.draw remote",
+                cycled(lambda c: rime.draw(keys[c])),
+                10000,
+            )
+            session.latencies.clear()
+            draw = cycled(lambda c: rime.draw(keys[c]))
+            for _ in range(600):
+                draw()
+            yield Count(
+                "RemoteSession round trips",
+                600,
+                sum(map(len, session.latencies.values())),
+            )
+            session.close()
+        finally:
+            socket_server.shutdown()
+            socket_server.server_close()
+            thread.join()
@@ -0,0 +1,148 @@
+r"""Session
+===========
+
+Benchmarks run against the tiny schema in ``benchmarks/rime``. When librime
+is not installed, ``FakeSession`` mimics it in pure python.
+"""
+
+import os
+from dataclasses import dataclass
+from tempfile import gettempdir
+
+from pyrime.ime import Candidates, Commit, Composition, Context, Menu
+from pyrime.key import Key
+from pyrime.utils import SessionBase
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "rime")
+SCHEMA_ID = "bench"
+SPACE = Key.new(" ").basic
+BACKSPACE = Key.new("<bs>").basic
+ESCAPE = Key.new("<esc>").basic
+
+
+@dataclass
+class FakeSession(SessionBase):
+    r"""A fake session.
+
+    Lower letters are appended to preedit. ``<space>`` or a digit commits a
+    candidate, ``<bs>`` deletes a letter and ``<esc>`` clears preedit.
+    """
+
+    page_size: int = 10
+    preedit: str = ""
+    commit: str = ""
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param self:
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        if mask != 0:
+            return False
+        if ord("a") <= keycode <= ord("z"):
+            self.preedit += chr(keycode)
+            return True
+        if self.preedit == "":
+            return False
+        if keycode == SPACE:
+            keycode = ord("1")
+        if ord("1") <= keycode <= ord("9"):
+            self.commit = self.preedit + chr(keycode)
+            self.preedit = ""
+        elif keycode == BACKSPACE:
+            self.preedit = self.preedit[:-1]
+        elif keycode == ESCAPE:
+            self.preedit = ""
+        return True
+
+    def get_context(self) -> Context | None:
+        r"""Get context.
+
+        :param self:
+        :rtype: Context | None
+        """
+        length = len(self.preedit)
+        texts = tuple(f"{self.preedit}{i}" for i in range(self.page_size))
+        return Context(
+            Composition(length, length, 0, length, self.preedit or None),
+            Menu(
+                self.page_size,
+                0,
+                False,
+                0,
+                len(texts) if self.preedit else 0,
+                None,
+                Candidates(texts, (None,) * len(texts))
+                if self.preedit
+                else Candidates(),
+            ),
+        )
+
+    def get_commit(self) -> Commit | None:
+        r"""Get commit.
+
+        :param self:
+        :rtype: Commit | None
+        """
+        commit, self.commit = self.commit, ""
+        return Commit(commit) if commit else None
+
+    def commit_composition(self) -> bool:
+        r"""Commit composition.
+
+        :param self:
+        :rtype: bool
+        """
+        if self.preedit == "":
+            return False
+        self.commit, self.preedit = self.preedit, ""
+        return True
+
+    def clear_composition(self) -> None:
+        r"""Clear composition.
+
+        :param self:
+        :rtype: None
+        """
+        self.preedit = ""
+
+    def get_commit_text(self) -> str:
+        r"""Get commit text.
+
+        :param self:
+        :rtype: str
+        """
+        self.commit_composition()
+        commit = self.get_commit()
+        return commit.text if commit else ""
+
+
+def get_session() -> SessionBase:
+    r"""Get a session of the bundled schema, or a fake session.
+
+    :rtype: SessionBase
+    """
+    try:
+        from pyrime.api import Traits
+        from pyrime.session import Session
+    except ImportError:
+        return FakeSession()
+    user_data_dir = os.path.join(gettempdir(), "pyrime-benchmarks")
+    os.makedirs(user_data_dir, exist_ok=True)
+    session = Session(
+        Traits(
+            shared_data_dir=DATA_DIR,
+            user_data_dir=user_data_dir,
+            log_dir=user_data_dir,
+        )
+    )
+    # build the bundled schema if it is changed
+    if session.runtime.deploy():
+        session.runtime.join()
+    session.select_schema(SCHEMA_ID)
+    return session
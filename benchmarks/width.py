@@ -0,0 +1,37 @@
+r"""Width
+=========
+
+Width computation per keystroke. ``RimeLayout.update`` measures every line
+drawn by ``HorizontalUI`` and the input prompt.
+"""
+
+from collections.abc import Iterator
+
+from wcwidth import wcswidth
+
+from pyrime.ime import Candidates, Composition, Context, Menu
+from pyrime.ime.ui.horizontal import HorizontalUI
+from pyrime.ime.width import wcswidth as fast_wcswidth
+
+from . import Result, measure
+
+
+def run() -> Iterator[Result]:
+    r"""Run.
+
+    :rtype: Iterator[Result]
+    """
+    texts = tuple("我为玩问无万完网王外")
+    lines, _ = HorizontalUI().draw(
+        Context(
+            Composition(1, 1, 0, 1, "w"),
+            Menu(10, 1, False, 0, 10, None, Candidates(texts, (None,) * 10)),
+        )
+    )
+    lines += ("In [1]: ",)
+    for name, func in ("wcwidth", wcswidth), ("pyrime", fast_wcswidth):
+        yield measure(
+            f"{name}.wcswidth per keystroke",
+            lambda func=func: [func(line) for line in lines],
+            10000,
+        )
@@ -1,13 +1,56 @@
 r"""This module can be called by
 `python -m <https://docs.python.org/3/library/__main__.html>`_.
+
+Without a command, type keys to rime. ``serve`` starts a server hosting
+sessions for ``pyrime.client.RemoteSession``. ``convert`` converts key
+sequences from files or stdin, one per line, to text.
 """
 
-from getch import getch
+import fileinput
+import logging
+import sys
+from argparse import ArgumentParser
 
-from .key import Key
-from .rime import RimeBase
 
-if __name__ == "__main__":
+def get_parser() -> ArgumentParser:
+    r"""Get a parser.
+
+    :rtype: ArgumentParser
+    """
+    parser = ArgumentParser("pyrime")
+    subparsers = parser.add_subparsers(dest="command")
+    serve = subparsers.add_parser("serve", help="serve sessions")
+    serve.add_argument("--socket", help="socket path")
+    convert = subparsers.add_parser(
+        "convert", help="convert key sequences to text"
+    )
+    convert.add_argument(
+        "files", nargs="*", help="files of key sequences, default is stdin"
+    )
+    convert.add_argument(
+        "-k",
+        "--top-k",
+        type=int,
+        default=0,
+        help="output top k candidates of the first page as JSON lines",
+    )
+    convert.add_argument("-j", "--jobs", type=int, help="number of processes")
+    convert.add_argument(
+        "--chunk-size", type=int, default=64, help="lines per task"
+    )
+    return parser
+
+
+def run() -> None:
+    r"""Type keys to rime until ``<c-c>`` is pressed.
+
+    :rtype: None
+    """
+    from getch import getch
+
+    from .key import Key
+    from .rime import RimeBase
+
     rime = RimeBase()
     rime.is_enabled = True
     while True:
@@ -17,3 +60,34 @@ if __name__ == "__main__":
             break
         key = Key.new(c)
         rime(print, key)
+
+
+def main(argv: list[str] | None = None) -> None:
+    r"""Main.
+
+    :param argv:
+    :type argv: list[str] | None
+    :rtype: None
+    """
+    args = get_parser().parse_args(argv)
+    if args.command == "serve":
+        from .server import Server
+
+        logging.basicConfig(level=logging.INFO)
+        server = Server(args.socket) if args.socket else Server()
+        server.serve_forever()
+    elif args.command == "convert":
+        from .convert import Converter
+
+        converter = Converter(top_k=args.top_k, chunk_size=args.chunk_size)
+        if args.jobs:
+            converter.jobs = args.jobs
+        with fileinput.input(args.files, encoding="utf-8") as lines:
+            for text in converter(line.rstrip("\n") for line in lines):
+                sys.stdout.write(text + "\n")
+    else:
+        run()
+
+
+if __name__ == "__main__":
+    main()
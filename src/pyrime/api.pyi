@@ -5,10 +5,11 @@ Refer <https://github.com/rimeinn/rime.nvim/blob/main/lua/rime/traits.lua>
 """
 
 import os
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import cython as c
-from cython.cimports.cpython.long import PyLong_AsVoidPtr, PyLong_FromVoidPtr
+from cython.cimports.cpython.long import PyLong_FromVoidPtr
 from cython.cimports.rime_api import (
     RimeApi,
     RimeCandidate,
@@ -18,16 +19,29 @@ from cython.cimports.rime_api import (
     RimeMenu,
     RimeSchemaList,
     RimeSchemaListItem,
+    RimeSessionId,
     RimeTraits,
     rime_get_api,
 )
+from cython.cimports.rime_nogil import (
+    create_session_t,
+    deploy_t,
+    finalize_t,
+    get_context_t,
+    initialize_t,
+    join_maintenance_thread_t,
+    process_key_t,
+    setup_t,
+    simulate_key_sequence_t,
+    start_maintenance_t,
+)
 from platformdirs import site_data_dir, user_config_dir
 from platformdirs import user_data_dir as _user_data_dir
 
 from . import LogLevel, SchemaListItem, __version__
 from . import __name__ as NAME
 from .ime import (
-    Candidate,
+    Candidates,
     Commit,
     Composition,
     Context,
@@ -63,15 +77,15 @@ class Traits:
     app_name: str = "rime." + NAME
     modules: tuple[str, ...] = ("default",)
     min_log_level: LogLevel = LogLevel.FATAL
-    data_size: int = 0
-    address: int = 0
 
     def __post_init__(self) -> None:
-        r"""Initialize.
+        r"""Check directories.
         gentoo prefix will change ``$XDG_DATA_DIRS``,
         TODO: Android termux only change ``$PREFIX``, not ``$XDG_DATA_DIRS``.
         Use trime data paths as the fallback of data directories.
 
+        librime is not initialized here. See ``pyrime.runtime.Runtime``.
+
         :param self:
         :rtype: None
         """
@@ -79,100 +93,490 @@ class Traits:
             if not os.path.isdir(dir):
                 raise NotADirectoryError(dir)
         os.makedirs(self.log_dir, exist_ok=True)
-        c_min_log_level: c.int = self.min_log_level.value
-        traits: RimeTraits = RimeTraits(
-            shared_data_dir=self.shared_data_dir.encode(),
-            user_data_dir=self.user_data_dir.encode(),
-            distribution_name=self.distribution_name.encode(),
-            distribution_code_name=self.distribution_code_name.encode(),
-            distribution_version=self.distribution_version.encode(),
-            app_name=self.app_name.encode(),
+
+@c.cclass
+class _RimeTraits:
+    r"""Keep a ``RimeTraits`` and its encoded strings alive."""
+
+    traits: RimeTraits
+    data: tuple
+    modules: c.p_const_char[2]
+
+    def __init__(self, traits: Traits) -> None:
+        r"""Convert ``Traits`` to ``RimeTraits``.
+
+        :param self:
+        :param traits:
+        :type traits: Traits
+        :rtype: None
+        """
+        self.data = tuple(
+            text.encode()
+            for text in (
+                traits.shared_data_dir,
+                traits.user_data_dir,
+                traits.distribution_name,
+                traits.distribution_code_name,
+                traits.distribution_version,
+                traits.app_name,
+                traits.log_dir,
+                traits.modules[0],
+            )
+        )
+        shared_data_dir: bytes = self.data[0]
+        user_data_dir: bytes = self.data[1]
+        distribution_name: bytes = self.data[2]
+        distribution_code_name: bytes = self.data[3]
+        distribution_version: bytes = self.data[4]
+        app_name: bytes = self.data[5]
+        log_dir: bytes = self.data[6]
+        module: bytes = self.data[7]
+        c_min_log_level: c.int = traits.min_log_level.value
+        self.traits = RimeTraits(
+            shared_data_dir=shared_data_dir,
+            user_data_dir=user_data_dir,
+            distribution_name=distribution_name,
+            distribution_code_name=distribution_code_name,
+            distribution_version=distribution_version,
+            app_name=app_name,
             min_log_level=c_min_log_level,
-            log_dir=self.log_dir.encode(),
+            log_dir=log_dir,
+        )
+        self.traits.data_size = c.sizeof(RimeTraits) - c.sizeof(
+            self.traits.data_size
         )
-        traits.data_size = c.sizeof(RimeTraits) - c.sizeof(traits.data_size)
-        traits.modules: c.array[c.p_const_char, len(self.modules) + 1] = [
-            self.modules[0].encode(),
-            c.NULL,
-        ]
-        self.data_size = traits.data_size
-        self.address = PyLong_FromVoidPtr(c.address(traits))
-
-        api: RimeApi = rime_get_api()[0]
-        api.setup(c.address(traits))
-        api.initialize(c.address(traits))
-
-    def __del__(self) -> None:
-        api: RimeApi = rime_get_api()[0]
-        api.finalize()
+        self.modules[0] = module
+        self.modules[1] = c.NULL
+        self.traits.modules = self.modules
+
+@c.cfunc
+def decode(text: c.p_char) -> str | None:
+    r"""Decode a nullable C string.
+
+    :param text:
+    :type text: c.p_char
+    :rtype: str | None
+    """
+    return None if text == c.NULL else text.decode()
+
+@c.cfunc
+def get_composition(composition: c.pointer[RimeComposition]) -> Composition:
+    r"""Copy ``RimeComposition``.
+
+    :param composition:
+    :type composition: c.pointer[RimeComposition]
+    :rtype: Composition
+    """
+    return Composition(
+        c.cast(int, composition.length),
+        c.cast(int, composition.cursor_pos),
+        c.cast(int, composition.sel_start),
+        c.cast(int, composition.sel_end),
+        decode(composition.preedit),
+    )
 
-@dataclass
+@c.cfunc
+def get_candidates(menu: c.pointer[RimeMenu]) -> Candidates:
+    r"""Copy candidates of ``RimeMenu``.
+
+    :param menu:
+    :type menu: c.pointer[RimeMenu]
+    :rtype: Candidates
+    """
+    texts: list[str] = []
+    comments: list[str | None] = []
+    i: c.int
+    for i in range(menu.num_candidates):
+        candidate: RimeCandidate = menu.candidates[i]
+        texts += [candidate.text.decode()]
+        comments += [decode(candidate.comment)]
+    return Candidates(tuple(texts), tuple(comments))
+
+@c.cfunc
+@c.with_gil
+@c.exceptval(check=False)
+def notify(
+    context_object: c.p_void,
+    session_id: RimeSessionId,
+    message_type: c.p_const_char,
+    message_value: c.p_const_char,
+) -> c.void:
+    r"""Pass a notification of librime to the handler of ``API``.
+
+    librime calls it from its maintenance thread.
+
+    :param context_object: an ``API``
+    :type context_object: c.p_void
+    :param session_id:
+    :type session_id: int
+    :param message_type: such as ``"deploy"``
+    :type message_type: c.p_const_char
+    :param message_value: such as ``"start"``, ``"success"``, ``"failure"``
+    :type message_value: c.p_const_char
+    :rtype: None
+    """
+    api: API = c.cast(API, context_object)
+    if api.handler is not None:
+        api.handler(
+            session_id,
+            decode(c.cast(c.p_char, message_type)),
+            decode(c.cast(c.p_char, message_value)),
+        )
+
+@c.cclass
+class ContextView:
+    r"""A lazy view of ``RimeContext``.
+
+    Like ``Context``, but fields are decoded only when they are accessed.
+    librime's memory is freed by ``close()``, or when a ``with`` statement
+    exits.
+    """
+
+    api: c.pointer[RimeApi]
+    context: RimeContext
+    closed = c.declare(c.bint, visibility="readonly")
+    _composition: object
+    _menu: object
+
+    def __enter__(self) -> ContextView:
+        r"""Enter.
+
+        :param self:
+        :rtype: ContextView
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        r"""Exit.
+
+        :param self:
+        :param args:
+        :rtype: None
+        """
+        self.close()
+
+    def __dealloc__(self) -> None:
+        r"""Dealloc.
+
+        :param self:
+        :rtype: None
+        """
+        if not self.closed:
+            self.api.free_context(c.address(self.context))
+
+    @c.ccall
+    def close(self) -> None:
+        r"""Free librime's memory.
+
+        :param self:
+        :rtype: None
+        """
+        if not self.closed:
+            self.closed = True
+            self.api.free_context(c.address(self.context))
+
+    @c.cfunc
+    def check(self) -> c.int:
+        r"""Raise an error if closed.
+
+        :param self:
+        :rtype: int
+        """
+        if self.closed:
+            raise ValueError("context is closed")
+        return 0
+
+    @property
+    def composition(self) -> Composition:
+        r"""Composition.
+
+        :param self:
+        :rtype: Composition
+        """
+        if self._composition is None:
+            self.check()
+            self._composition = get_composition(
+                c.address(self.context.composition)
+            )
+        return self._composition
+
+    @property
+    def menu(self) -> MenuView:
+        r"""Menu.
+
+        :param self:
+        :rtype: MenuView
+        """
+        if self._menu is None:
+            self.check()
+            menu: MenuView = MenuView.__new__(MenuView)
+            menu.view = self
+            self._menu = menu
+        return self._menu
+
+@c.cclass
+class MenuView:
+    r"""A lazy view of ``RimeMenu``."""
+
+    view: ContextView
+    _select_keys: object
+    _candidates: object
+
+    @property
+    def page_size(self) -> int:
+        r"""Page size.
+
+        :param self:
+        :rtype: int
+        """
+        self.view.check()
+        return self.view.context.menu.page_size
+
+    @property
+    def page_no(self) -> int:
+        r"""Page no.
+
+        :param self:
+        :rtype: int
+        """
+        self.view.check()
+        return self.view.context.menu.page_no
+
+    @property
+    def is_last_page(self) -> bool:
+        r"""Is last page.
+
+        :param self:
+        :rtype: bool
+        """
+        self.view.check()
+        return self.view.context.menu.is_last_page == 1
+
+    @property
+    def highlighted_candidate_index(self) -> int:
+        r"""Highlighted candidate index.
+
+        :param self:
+        :rtype: int
+        """
+        self.view.check()
+        return self.view.context.menu.highlighted_candidate_index
+
+    @property
+    def num_candidates(self) -> int:
+        r"""Num candidates.
+
+        :param self:
+        :rtype: int
+        """
+        self.view.check()
+        return self.view.context.menu.num_candidates
+
+    @property
+    def select_keys(self) -> str | None:
+        r"""Select keys.
+
+        :param self:
+        :rtype: str | None
+        """
+        if self._select_keys is None:
+            self.view.check()
+            self._select_keys = decode(self.view.context.menu.select_keys)
+        return self._select_keys
+
+    @property
+    def candidates(self) -> Candidates:
+        r"""Candidates.
+
+        :param self:
+        :rtype: Candidates
+        """
+        if self._candidates is None:
+            self.view.check()
+            self._candidates = get_candidates(
+                c.address(self.view.context.menu)
+            )
+        return self._candidates
+
+@c.cclass
 class API:
-    address: int = 0
+    r"""Rime API.
 
-    def __post_init__(self) -> None:
+    Hold the ``RimeApi`` pointer returned by ``rime_get_api()``.
+
+    librime may keep the strings of ``RimeTraits`` passed to ``setup()`` and
+    ``initialize()``, so they are kept alive until ``finalize()``.
+    """
+
+    api: c.pointer[RimeApi]
+    handler: object
+    rime_traits: list
+
+    def __cinit__(self) -> None:
         r"""Get Rime API.
 
         :param self:
         :rtype: None
         """
-        self.address: int = PyLong_FromVoidPtr(rime_get_api())
+        self.api = rime_get_api()
+        self.rime_traits = []
+
+    def __dealloc__(self) -> None:
+        r"""Unset the notification handler referring ``self``.
+
+        :param self:
+        :rtype: None
+        """
+        if self.handler is not None:
+            self.api.set_notification_handler(c.NULL, c.NULL)
+
+    @property
+    def address(self) -> int:
+        r"""Address of ``RimeApi``.
 
+        :param self:
+        :rtype: int
+        """
+        return PyLong_FromVoidPtr(self.api)
+
+    @c.ccall
     def setup(self, traits: Traits) -> None:
-        r"""Setup.
+        r"""Setup without GIL.
 
         :param self:
         :param traits:
         :type traits: Traits
         :rtype: None
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        p_traits: c.pointer[RimeTraits] = c.cast(
-            c.pointer[RimeTraits], PyLong_AsVoidPtr(traits.address)
-        )
-        api.setup(p_traits)
-
+        setup: setup_t = c.cast(setup_t, self.api.setup)
+        rime_traits: _RimeTraits = _RimeTraits(traits)
+        self.rime_traits.append(rime_traits)
+        p_traits: c.pointer[RimeTraits] = c.address(rime_traits.traits)
+        with c.nogil:
+            setup(p_traits)
+
+    @c.ccall
     def initialize(self, traits: Traits) -> None:
-        r"""Initialize. after ``setup()``.
+        r"""Initialize without GIL. after ``setup()``.
 
         :param self:
         :param traits:
         :type traits: Traits
         :rtype: None
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        p_traits: c.pointer[RimeTraits] = c.cast(
-            c.pointer[RimeTraits], PyLong_AsVoidPtr(traits.address)
+        initialize: initialize_t = c.cast(initialize_t, self.api.initialize)
+        rime_traits: _RimeTraits = _RimeTraits(traits)
+        self.rime_traits.append(rime_traits)
+        p_traits: c.pointer[RimeTraits] = c.address(rime_traits.traits)
+        with c.nogil:
+            initialize(p_traits)
+
+    @c.ccall
+    def finalize(self) -> None:
+        r"""Finalize without GIL. It waits for the maintenance thread.
+
+        :param self:
+        :rtype: None
+        """
+        finalize: finalize_t = c.cast(finalize_t, self.api.finalize)
+        with c.nogil:
+            finalize()
+        self.rime_traits = []
+
+    @c.ccall
+    def set_notification_handler(
+        self, handler: Callable[[int, str, str], object] | None
+    ) -> None:
+        r"""Set notification handler.
+
+        It is called from librime's maintenance thread with
+        ``(session_id, message_type, message_value)`` such as
+        ``(0, "deploy", "success")``.
+
+        :param self:
+        :param handler:
+        :type handler: Callable[[int, str, str], object] | None
+        :rtype: None
+        """
+        self.handler = handler
+        if handler is None:
+            self.api.set_notification_handler(c.NULL, c.NULL)
+        else:
+            self.api.set_notification_handler(notify, c.cast(c.p_void, self))
+
+    @c.ccall
+    def start_maintenance(self, full_check: c.bint) -> c.bint:
+        r"""Start maintenance without GIL.
+
+        Deployment runs in librime's maintenance thread. Sessions cannot be
+        created and keys are not processed until it finishes.
+
+        :param self:
+        :param full_check: deploy even if no file is modified
+        :type full_check: bool
+        :return: whether maintenance is started
+        :rtype: bool
+        """
+        start_maintenance: start_maintenance_t = c.cast(
+            start_maintenance_t, self.api.start_maintenance
+        )
+        result: c.int
+        with c.nogil:
+            result = start_maintenance(full_check)
+        return result == 1
+
+    @c.ccall
+    def is_maintenance_mode(self) -> c.bint:
+        r"""Is maintenance mode.
+
+        :param self:
+        :rtype: bool
+        """
+        return self.api.is_maintenance_mode() == 1
+
+    @c.ccall
+    def join_maintenance_thread(self) -> None:
+        r"""Wait for the maintenance thread without GIL.
+
+        :param self:
+        :rtype: None
+        """
+        join_maintenance_thread: join_maintenance_thread_t = c.cast(
+            join_maintenance_thread_t, self.api.join_maintenance_thread
         )
-        api.initialize(p_traits)
+        with c.nogil:
+            join_maintenance_thread()
 
-    def finalize(self) -> int:
-        r"""Finalize.
+    @c.ccall
+    def deploy(self) -> c.bint:
+        r"""Deploy in the current thread without GIL.
 
         :param self:
-        :rtype: int
+        :rtype: bool
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.finalize()
+        deploy: deploy_t = c.cast(deploy_t, self.api.deploy)
+        result: c.int
+        with c.nogil:
+            result = deploy()
+        return result == 1
 
-    def create_session(self) -> int:
-        r"""Create session.
+    @c.ccall
+    def create_session(self) -> RimeSessionId:
+        r"""Create session without GIL.
 
         :param self:
         :rtype: int
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.create_session()
+        create_session: create_session_t = c.cast(
+            create_session_t, self.api.create_session
+        )
+        session_id: RimeSessionId
+        with c.nogil:
+            session_id = create_session()
+        return session_id
 
-    def destroy_session(self, session_id: int) -> None:
+    @c.ccall
+    def destroy_session(self, session_id: RimeSessionId) -> None:
         r"""Destroy session.
 
         :param self:
@@ -180,12 +584,10 @@ class API:
         :type session_id: int
         :rtype: None
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.destroy_session(session_id)
+        self.api.destroy_session(session_id)
 
-    def get_current_schema(self, session_id: int) -> str:
+    @c.ccall
+    def get_current_schema(self, session_id: RimeSessionId) -> str:
         r"""Get current schema.
 
         :param self:
@@ -193,13 +595,11 @@ class API:
         :type session_id: int
         :rtype: str
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
         schema_id: c.char[1024] = c.declare(c.char[1024])  # type: ignore
-        api.get_current_schema(session_id, schema_id, c.sizeof(schema_id))
+        self.api.get_current_schema(session_id, schema_id, c.sizeof(schema_id))
         return schema_id.decode()
 
+    @c.ccall
     def get_schema_list(self) -> list[SchemaListItem]:
         r"""Get schema list.
 
@@ -207,23 +607,27 @@ class API:
         :rtype: list[SchemaListItem]
         """
         schema_list: RimeSchemaList = c.declare(RimeSchemaList)
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        api.get_schema_list(c.address(schema_list))
+        if self.api.get_schema_list(c.address(schema_list)) != 1:
+            return []
         results: list[SchemaListItem] = []
         i: c.int
-        for i in range(schema_list.size):
-            schema: RimeSchemaListItem = schema_list.list[i]
-            results += [
-                SchemaListItem(
-                    schema.schema_id.decode(),
-                    schema.name.decode(),
-                )
-            ]
+        try:
+            for i in range(schema_list.size):
+                schema: RimeSchemaListItem = schema_list.list[i]
+                results += [
+                    SchemaListItem(
+                        schema.schema_id.decode(),
+                        schema.name.decode(),
+                    )
+                ]
+        finally:
+            self.api.free_schema_list(c.address(schema_list))
         return results
 
-    def select_schema(self, session_id: int, schema_id: str) -> bool:
+    @c.ccall
+    def select_schema(
+        self, session_id: RimeSessionId, schema_id: str
+    ) -> c.bint:
         r"""Select schema.
 
         :param self:
@@ -233,13 +637,13 @@ class API:
         :type schema_id: str
         :rtype: bool
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.select_schema(session_id, schema_id.encode()) == 1
+        return self.api.select_schema(session_id, schema_id.encode()) == 1
 
-    def process_key(self, session_id: int, keycode: int, mask: int) -> bool:
-        r"""Process key.
+    @c.ccall
+    def process_key(
+        self, session_id: RimeSessionId, keycode: c.int, mask: c.int
+    ) -> c.bint:
+        r"""Process key without GIL.
 
         :param self:
         :param session_id:
@@ -250,73 +654,136 @@ class API:
         :type mask: int
         :rtype: bool
         """
-        _keycode: c.int = keycode
-        _mask: c.int = mask
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.process_key(session_id, _keycode, _mask) == 1
+        process_key: process_key_t = c.cast(
+            process_key_t, self.api.process_key
+        )
+        result: c.int
+        with c.nogil:
+            result = process_key(session_id, keycode, mask)
+        return result == 1
+
+    @c.ccall
+    @c.boundscheck(False)
+    @c.wraparound(False)
+    def process_keys(
+        self, session_id: RimeSessionId, keycodes: c.int[:], masks: c.int[:]
+    ) -> c.Py_ssize_t:
+        r"""Process keys without GIL until a key is not processed.
 
-    def get_context(self, session_id: int) -> Context | None:
-        r"""Get context.
+        :param self:
+        :param session_id:
+        :type session_id: int
+        :param keycodes: a buffer of C ``int`` such as ``array("i")``
+        :type keycodes: c.int[:]
+        :param masks: a buffer of C ``int`` such as ``array("i")``
+        :type masks: c.int[:]
+        :return: the index of the first unprocessed key, or the number of
+            keys if all keys are processed
+        :rtype: int
+        """
+        if keycodes.shape[0] != masks.shape[0]:
+            raise ValueError("keycodes and masks have different lengths")
+        process_key: process_key_t = c.cast(
+            process_key_t, self.api.process_key
+        )
+        number: c.Py_ssize_t = keycodes.shape[0]
+        i: c.Py_ssize_t = 0
+        with c.nogil:
+            while i < number and process_key(
+                session_id, keycodes[i], masks[i]
+            ):
+                i += 1
+        return i
+
+    @c.ccall
+    def simulate_key_sequence(
+        self, session_id: RimeSessionId, key_sequence: str
+    ) -> c.bint:
+        r"""Simulate key sequence without GIL.
+
+        :param self:
+        :param session_id:
+        :type session_id: int
+        :param key_sequence: such as ``"nihao{space}"``
+        :type key_sequence: str
+        :rtype: bool
+        """
+        simulate: simulate_key_sequence_t = c.cast(
+            simulate_key_sequence_t, self.api.simulate_key_sequence
+        )
+        data: bytes = key_sequence.encode()
+        p_data: c.p_const_char = data
+        result: c.int
+        with c.nogil:
+            result = simulate(session_id, p_data)
+        return result == 1
+
+    @c.ccall
+    def get_context(self, session_id: RimeSessionId) -> Context | None:
+        r"""Get context without GIL.
 
         :param self:
         :param session_id:
         :type session_id: int
         :rtype: Context | None
         """
+        get_context: get_context_t = c.cast(
+            get_context_t, self.api.get_context
+        )
         context: RimeContext = c.declare(RimeContext)
         context.data_size = c.sizeof(RimeContext) - c.sizeof(context.data_size)
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        if api.get_context(session_id, c.address(context)) != 1:
+        result: c.int
+        with c.nogil:
+            result = get_context(session_id, c.address(context))
+        if result != 1:
             return None
-        composition: RimeComposition = context.composition
-        preedit: str | None = (
-            None
-            if composition.preedit == c.NULL
-            else composition.preedit.decode()
-        )
-        menu: RimeMenu = context.menu
-        select_keys: str | None = (
-            None if menu.select_keys == c.NULL else menu.select_keys.decode()
-        )
-        candidates: list[Candidate] = []
-        i: c.int
-        for i in range(menu.num_candidates):
-            candidate: RimeCandidate = menu.candidates[i]
-            comment: str | None = (
-                None
-                if candidate.comment == c.NULL
-                else candidate.comment.decode()
+        try:
+            menu: RimeMenu = context.menu
+            return Context(
+                get_composition(c.address(context.composition)),
+                Menu(
+                    c.cast(int, menu.page_size),
+                    c.cast(int, menu.page_no),
+                    menu.is_last_page == 1,
+                    c.cast(int, menu.highlighted_candidate_index),
+                    c.cast(int, menu.num_candidates),
+                    decode(menu.select_keys),
+                    get_candidates(c.address(menu)),
+                ),
             )
-            candidates += [
-                Candidate(
-                    candidate.text.decode(),
-                    comment,
-                )
-            ]
-        return Context(
-            Composition(
-                c.cast(int, composition.length),
-                c.cast(int, composition.cursor_pos),
-                c.cast(int, composition.sel_start),
-                c.cast(int, composition.sel_end),
-                preedit,
-            ),
-            Menu(
-                c.cast(int, menu.page_size),
-                c.cast(int, menu.page_no),
-                menu.is_last_page == 1,
-                c.cast(int, menu.highlighted_candidate_index),
-                c.cast(int, menu.num_candidates),
-                select_keys,
-                candidates,
-            ),
+        finally:
+            self.api.free_context(c.address(context))
+
+    @c.ccall
+    def get_context_view(
+        self, session_id: RimeSessionId
+    ) -> ContextView | None:
+        r"""Get a lazy view of context without GIL.
+
+        :param self:
+        :param session_id:
+        :type session_id: int
+        :rtype: ContextView | None
+        """
+        get_context: get_context_t = c.cast(
+            get_context_t, self.api.get_context
         )
+        view: ContextView = ContextView.__new__(ContextView)
+        view.api = self.api
+        view.context.data_size = c.sizeof(RimeContext) - c.sizeof(
+            view.context.data_size
+        )
+        context: c.pointer[RimeContext] = c.address(view.context)
+        result: c.int
+        with c.nogil:
+            result = get_context(session_id, context)
+        if result != 1:
+            view.closed = True
+            return None
+        return view
 
-    def get_commit(self, session_id: int) -> Commit | None:
+    @c.ccall
+    def get_commit(self, session_id: RimeSessionId) -> Commit | None:
         r"""Get commit.
 
         :param self:
@@ -326,14 +793,15 @@ class API:
         """
         commit: RimeCommit = c.declare(RimeCommit)
         commit.data_size = c.sizeof(RimeCommit) - c.sizeof(commit.data_size)
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        if api.get_commit(session_id, c.address(commit)) != 1:
+        if self.api.get_commit(session_id, c.address(commit)) != 1:
             return None
-        return Commit(commit.text.decode())
+        try:
+            return Commit(commit.text.decode())
+        finally:
+            self.api.free_commit(c.address(commit))
 
-    def commit_composition(self, session_id: int) -> bool:
+    @c.ccall
+    def commit_composition(self, session_id: RimeSessionId) -> c.bint:
         r"""Commit composition.
 
         :param self:
@@ -341,12 +809,10 @@ class API:
         :type session_id: int
         :rtype: bool
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        return api.commit_composition(session_id) == 1
+        return self.api.commit_composition(session_id) == 1
 
-    def clear_composition(self, session_id: int) -> None:
+    @c.ccall
+    def clear_composition(self, session_id: RimeSessionId) -> None:
         r"""Clear composition.
 
         :param self:
@@ -354,7 +820,4 @@ class API:
         :type session_id: int
         :rtype: None
         """
-        api: RimeApi = c.cast(
-            c.pointer[RimeApi], PyLong_AsVoidPtr(self.address)
-        )[0]
-        api.clear_composition(session_id)
+        self.api.clear_composition(session_id)
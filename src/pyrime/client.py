@@ -0,0 +1,246 @@
+r"""Client
+==========
+
+A session of ``pyrime.server``. librime is loaded by the server, so the
+client only needs a socket.
+
+``process_key()`` and ``process_keys()`` return context with their result
+in one round trip. It is cached until the session is changed, so the
+following ``get_context()`` of ``RimeBase.draw()`` doesn't need a round
+trip. So does ``is_maintenance_mode()``.
+"""
+
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from socket import AF_UNIX, SOCK_STREAM, socket
+from statistics import quantiles
+from time import perf_counter_ns
+from typing import Any
+
+from . import SchemaListItem
+from .ime import Commit, Context
+from .server import get_socket_path, load_context, recv, send
+from .utils import SessionBase
+
+# methods which don't change the session
+CONST_METHODS = {
+    "get_context",
+    "get_current_schema",
+    "get_schema_list",
+    "is_maintenance_mode",
+}
+
+
+@dataclass
+class RemoteSession(SessionBase):
+    r"""A session of a server.
+
+    ``latencies`` records the round trip time of the last
+    ``max_latencies`` requests in nanoseconds per method, so memory doesn't
+    grow with the session.
+    """
+
+    path: str = field(default_factory=get_socket_path)
+    latencies: dict[str, deque[int]] = field(default_factory=dict)
+    max_latencies: int = 1024
+
+    def __post_init__(self) -> None:
+        r"""Connect.
+
+        :rtype: None
+        """
+        self.socket = socket(AF_UNIX, SOCK_STREAM)
+        self.socket.connect(self.path)
+        self.file = self.socket.makefile("rb")
+        self.context: Context | None = None
+        self.has_context = False
+        self.maintenance = False
+
+    def close(self) -> None:
+        r"""Close the connection. The server reuses the session.
+
+        :param self:
+        :rtype: None
+        """
+        self.file.close()
+        self.socket.close()
+
+    def __del__(self) -> None:
+        r"""Del.
+
+        :param self:
+        :rtype: None
+        """
+        if "socket" in vars(self):
+            self.close()
+
+    def call(self, method: str, *params: Any) -> Any:
+        r"""Call a method of the server's session.
+
+        :param self:
+        :param method:
+        :type method: str
+        :param params:
+        :type params: Any
+        :rtype: Any
+        """
+        if method not in CONST_METHODS:
+            self.has_context = False
+        begin = perf_counter_ns()
+        send(self.socket, [method, *params])
+        response = recv(self.file)
+        latency = perf_counter_ns() - begin
+        if method not in self.latencies:
+            self.latencies[method] = deque(maxlen=self.max_latencies)
+        self.latencies[method].append(latency)
+        if response is None:
+            raise ConnectionError("server closed the connection")
+        error, result = response
+        if error:
+            raise RuntimeError(result)
+        return result
+
+    def get_metrics(self) -> dict[str, tuple[int, float, float]]:
+        r"""Get the number, the median and the 99th percentile of recent
+        latencies in nanoseconds per method.
+
+        :param self:
+        :rtype: dict[str, tuple[int, float, float]]
+        """
+        metrics = {}
+        for method, times in self.latencies.items():
+            if len(times) < 2:
+                metrics[method] = (len(times), times[0], times[0])
+                continue
+            percentiles = quantiles(times, n=100)
+            metrics[method] = (len(times), percentiles[49], percentiles[98])
+        return metrics
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param self:
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        return self.process_keys((keycode,), (mask,)) == 1
+
+    def process_keys(
+        self, keycodes: Sequence[int], masks: Sequence[int]
+    ) -> int:
+        r"""Process keys and cache context.
+
+        :param self:
+        :param keycodes:
+        :type keycodes: Sequence[int]
+        :param masks:
+        :type masks: Sequence[int]
+        :return: the index of the first unprocessed key, or the number of
+            keys if all keys are processed
+        :rtype: int
+        """
+        index, context, self.maintenance = self.call(
+            "process_keys_context", list(keycodes), list(masks)
+        )
+        self.context = load_context(context)
+        self.has_context = True
+        return index
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode when keys are processed last time.
+
+        librime doesn't process keys when deploying, so a stale ``False``
+        only delays passing keys through. A cached ``True`` is checked by
+        the server, because ``RimeBase.draw()`` doesn't process keys to
+        refresh it until it is ``False``.
+
+        :param self:
+        :rtype: bool
+        """
+        if self.maintenance:
+            self.maintenance = self.call("is_maintenance_mode")
+        return self.maintenance
+
+    def simulate(self, sequence: str) -> bool:
+        r"""Simulate a key sequence such as ``"nihao{space}"``.
+
+        :param self:
+        :param sequence:
+        :type sequence: str
+        :rtype: bool
+        """
+        return self.call("simulate", sequence)
+
+    def get_context(self) -> Context | None:
+        r"""Get context. It is cached by ``process_keys()``.
+
+        :param self:
+        :rtype: Context | None
+        """
+        if not self.has_context:
+            self.context = load_context(self.call("get_context"))
+            self.has_context = True
+        return self.context
+
+    def get_commit(self) -> Commit | None:
+        r"""Get commit.
+
+        :param self:
+        :rtype: Commit | None
+        """
+        text = self.call("get_commit")
+        return None if text is None else Commit(text)
+
+    def get_current_schema(self) -> str:
+        r"""Get current schema.
+
+        :param self:
+        :rtype: str
+        """
+        return self.call("get_current_schema")
+
+    def get_schema_list(self) -> list[SchemaListItem]:
+        r"""Get schema list.
+
+        :param self:
+        :rtype: list[SchemaListItem]
+        """
+        return [SchemaListItem(*item) for item in self.call("get_schema_list")]
+
+    def select_schema(self, schema_id: str) -> bool:
+        r"""Select schema.
+
+        :param self:
+        :param schema_id:
+        :type schema_id: str
+        :rtype: bool
+        """
+        return self.call("select_schema", schema_id)
+
+    def commit_composition(self) -> bool:
+        r"""Commit composition.
+
+        :param self:
+        :rtype: bool
+        """
+        return self.call("commit_composition")
+
+    def clear_composition(self) -> None:
+        r"""Clear composition.
+
+        :param self:
+        :rtype: None
+        """
+        self.call("clear_composition")
+
+    def get_commit_text(self) -> str:
+        r"""Get commit text.
+
+        :param self:
+        :rtype: str
+        """
+        return self.call("get_commit_text")
@@ -0,0 +1,206 @@
+r"""Convert
+===========
+
+Convert key sequences such as ``nihao`` to text in bulk by
+``python -m pyrime convert``.
+
+Lines are converted in chunks by a pool of processes. Every process owns
+its librime runtime and session. At most ``2 * jobs`` chunks are pending,
+so a large input isn't read into memory, and the output keeps the order
+of the input.
+
+Every process uses a temporary user data directory with a copy of the
+user's config and hard links to the built dictionaries. The user
+dictionary isn't learned and isn't locked by other processes, so results
+don't depend on which process converts a line.
+"""
+
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from shutil import copy2, copytree
+from tempfile import TemporaryDirectory, mkdtemp
+from time import sleep
+
+from .utils import SessionBase
+
+# the session of a worker process
+session: SessionBase | None = None
+
+
+def get_chunks(lines: Iterable[str], size: int) -> Iterator[tuple[str, ...]]:
+    r"""Split lines to chunks lazily.
+
+    :param lines:
+    :type lines: Iterable[str]
+    :param size:
+    :type size: int
+    :rtype: Iterator[tuple[str, ...]]
+    """
+    iterator = iter(lines)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
+
+
+def link(src: str, dst: str) -> str:
+    r"""Hard link a file, or copy it if it cannot be linked, such as across
+    file systems.
+
+    :param src:
+    :type src: str
+    :param dst:
+    :type dst: str
+    :rtype: str
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        return copy2(src, dst)
+    return dst
+
+
+def create_session(user_data_dir: str) -> SessionBase:
+    r"""Create a session using a copy of the user's data.
+
+    Config files are copied, and files of the ``build`` directory are hard
+    linked, user dictionaries are not. If librime cannot be loaded, raise
+    ``ImportError`` rather than falling back to ``SessionBase`` which
+    outputs the input.
+
+    :param user_data_dir: an empty directory
+    :type user_data_dir: str
+    :rtype: SessionBase
+    """
+    from .api import Traits
+    from .session import Session
+
+    traits = Traits()
+    for name in os.listdir(traits.user_data_dir):
+        path = os.path.join(traits.user_data_dir, name)
+        if name == "build" and os.path.isdir(path):
+            copytree(
+                path, os.path.join(user_data_dir, name), copy_function=link
+            )
+        elif name.endswith((".yaml", ".txt")) and os.path.isfile(path):
+            copy2(path, user_data_dir)
+    session = Session(
+        replace(traits, user_data_dir=user_data_dir, log_dir=user_data_dir)
+    )
+    if session.runtime.deploy():
+        session.runtime.join()
+    return session
+
+
+def init(factory: Callable[[str], SessionBase], tempdir: str) -> None:
+    r"""Create the session of a worker process.
+
+    :param factory:
+    :type factory: Callable[[str], SessionBase]
+    :param tempdir: a directory to create the user data directory in
+    :type tempdir: str
+    :rtype: None
+    """
+    global session
+    session = factory(mkdtemp(dir=tempdir))
+    # wait for deploying
+    while session.is_maintenance_mode():
+        sleep(0.01)
+
+
+def convert_line(session: SessionBase, line: str, top_k: int) -> str:
+    r"""Convert a line.
+
+    :param session:
+    :type session: SessionBase
+    :param line: a key sequence such as ``"nihao"`` or ``"nihao{space}"``
+    :type line: str
+    :param top_k: if it is ``0``, output the committed text followed by
+        the first candidate, or by the preedit if there is no candidate.
+        Otherwise, output top ``top_k`` candidates following the committed
+        text as JSON.
+    :type top_k: int
+    :rtype: str
+    """
+    session.clear_composition()
+    session.simulate(line)
+    # such as the text committed by "{space}" or punctuation
+    commit = session.get_commit()
+    text = "" if commit is None else commit.text
+    context = session.get_context()
+    texts: tuple[str, ...] = ()
+    if context is not None:
+        texts = tuple(candidate.text for candidate in context.menu.candidates)
+    if top_k:
+        return json.dumps(
+            {
+                "input": line,
+                "candidates": [text + candidate for candidate in texts[:top_k]]
+                or ([text] if text else []),
+            },
+            ensure_ascii=False,
+        )
+    if texts:
+        return text + texts[0]
+    if context is not None and context.composition.preedit:
+        text += context.composition.preedit
+    return text or line
+
+
+def convert_lines(lines: tuple[str, ...], top_k: int) -> list[str]:
+    r"""Convert lines by the session of the worker process.
+
+    :param lines:
+    :type lines: tuple[str, ...]
+    :param top_k:
+    :type top_k: int
+    :rtype: list[str]
+    """
+    if session is None:
+        raise RuntimeError("the worker process is not initialized")
+    return [convert_line(session, line, top_k) for line in lines]
+
+
+@dataclass
+class Converter:
+    r"""Convert lines by a pool of processes.
+
+    If ``jobs`` is ``1``, lines are converted by the current process.
+    ``factory`` creates a session from an empty user data directory, which
+    is removed after converting.
+    """
+
+    factory: Callable[[str], SessionBase] = create_session
+    top_k: int = 0
+    jobs: int = field(default_factory=lambda: os.cpu_count() or 1)
+    chunk_size: int = 64
+
+    def __call__(self, lines: Iterable[str]) -> Iterator[str]:
+        r"""Convert lines in order.
+
+        :param self:
+        :param lines: key sequences without trailing newlines
+        :type lines: Iterable[str]
+        :rtype: Iterator[str]
+        """
+        with TemporaryDirectory(prefix="pyrime-") as tempdir:
+            if self.jobs == 1:
+                init(self.factory, tempdir)
+                for chunk in get_chunks(lines, self.chunk_size):
+                    yield from convert_lines(chunk, self.top_k)
+                return
+            pending: deque[Future[list[str]]] = deque()
+            with ProcessPoolExecutor(
+                self.jobs, initializer=init, initargs=(self.factory, tempdir)
+            ) as executor:
+                for chunk in get_chunks(lines, self.chunk_size):
+                    if len(pending) >= 2 * self.jobs:
+                        yield from pending.popleft().result()
+                    pending += [
+                        executor.submit(convert_lines, chunk, self.top_k)
+                    ]
+                while pending:
+                    yield from pending.popleft().result()
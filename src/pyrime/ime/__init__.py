@@ -9,10 +9,12 @@ If any other IME such as pyfcitx is realized, this library can be standalone
 like <https://luarocks.org/modules/freed-wu/ime> named pyime.
 """
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
+from typing import overload
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Composition:
     r"""Composition."""
 
@@ -23,7 +25,7 @@ class Composition:
     preedit: str | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Candidate:
     r"""Candidate."""
 
@@ -31,7 +33,53 @@ class Candidate:
     comment: str | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class Candidates(Sequence[Candidate]):
+    r"""A page of candidates.
+
+    Store texts and comments as two tuples rather than one ``Candidate`` per
+    candidate. ``Candidate``s are created only when they are accessed.
+    """
+
+    texts: tuple[str, ...] = ()
+    comments: tuple[str | None, ...] = ()
+
+    @overload
+    def __getitem__(self, index: int) -> Candidate: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Candidates": ...
+
+    def __getitem__(self, index: int | slice) -> "Candidate | Candidates":
+        r"""Get item.
+
+        :param self:
+        :param index:
+        :type index: int | slice
+        :rtype: Candidate | Candidates
+        """
+        if isinstance(index, slice):
+            return Candidates(self.texts[index], self.comments[index])
+        return Candidate(self.texts[index], self.comments[index])
+
+    def __len__(self) -> int:
+        r"""Len.
+
+        :param self:
+        :rtype: int
+        """
+        return len(self.texts)
+
+    def __iter__(self) -> Iterator[Candidate]:
+        r"""Iter.
+
+        :param self:
+        :rtype: Iterator[Candidate]
+        """
+        return map(Candidate, self.texts, self.comments)
+
+
+@dataclass(slots=True, frozen=True)
 class Menu:
     r"""Menu."""
 
@@ -41,10 +89,10 @@ class Menu:
     highlighted_candidate_index: int
     num_candidates: int
     select_keys: str | None
-    candidates: list[Candidate]
+    candidates: Sequence[Candidate]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Context:
     r"""Context."""
 
@@ -52,7 +100,7 @@ class Context:
     menu: Menu
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Commit:
     r"""Commit."""
 
@@ -11,7 +11,7 @@ from enum import IntEnum, IntFlag
 from typing import Any, ClassVar, Self
 
 
-@dataclass
+@dataclass(frozen=True)
 class KeyBase(ABC):
     r"""Key.
 
@@ -20,6 +20,9 @@ class KeyBase(ABC):
     provide a factory method ``new()`` to create an instance from vim key name.
 
     basic name use lower, modifier name use upper first character.
+
+    Keys are immutable, so ``new()`` caches at most ``cache_size`` parsed
+    keys.
     """
 
     basic: int
@@ -39,10 +42,21 @@ class KeyBase(ABC):
         "<bslash>": "\\",
         "<bar>": "|",
     }
+    cache: ClassVar[dict[str, "KeyBase"]] = {}
+    cache_size: ClassVar[int] = 1024
 
     def __str__(self):
         r"""For GUI. if no modifier and basic is printable, print basic."""
-        if self.modifier > 0:
+        return self.char
+
+    @property
+    def char(self) -> str:
+        r"""The printable character typed by the key, or ``""`` for a
+        special key or a key with modifiers.
+
+        :rtype: str
+        """
+        if self.modifier > 0 or self.basic >= 0x100:
             return ""
         char = chr(self.basic)
         return char if char.isprintable() else ""
@@ -56,8 +70,8 @@ class KeyBase(ABC):
 
         :rtype: None
         """
-        self.basic = self.basic_enum(self.basic)
-        self.modifier = self.modifier_flag(self.modifier)
+        object.__setattr__(self, "basic", self.basic_enum(self.basic))
+        object.__setattr__(self, "modifier", self.modifier_flag(self.modifier))
 
     def __init_subclass__(
         cls, key_map: dict[str, int], shift: int, alt: int, control: int
@@ -76,6 +90,7 @@ class KeyBase(ABC):
         :rtype: None
         """
         super().__init_subclass__()
+        cls.cache = {}
         keys = {
             ("_" if k in "".join(map(str, range(10))) else "") + k: v
             for k, v in key_map.items()
@@ -90,6 +105,21 @@ class KeyBase(ABC):
     def new(cls, name: str) -> Self:
         r"""Create a Key from vim name.
 
+        :param name: '<Esc>', 'a', ...
+        :type name: str
+        :rtype: Self
+        """
+        key = cls.cache.get(name)
+        if key is None:
+            key = cls.parse(name)
+            if len(cls.cache) < cls.cache_size:
+                cls.cache[name] = key
+        return key  # type: ignore
+
+    @classmethod
+    def parse(cls, name: str) -> Self:
+        r"""Parse vim name without cache.
+
         :param name: '<Esc>', 'a', ...
         :type name: str
         :rtype: Self
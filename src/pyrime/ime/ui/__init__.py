@@ -6,9 +6,11 @@ Refer <https://github.com/rimeinn/ime.nvim/blob/0.0.5/packages/ime/lua/ime/ui.lu
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Self
 
-from .. import Context
+from .. import Candidate, Candidates, Context
 
 # https://github.com/Freed-Wu/tmux-digit/blob/547226faa6ea32b3805bcd9a5a54bf943b8e4c48/digit.tmux#L3-L9
 STYLES = {
@@ -22,13 +24,163 @@ STYLES = {
 }
 
 
+class Line(str):
+    r"""A line drawn from styled fragments.
+
+    It is a ``str``, and ``fragments`` is a list of ``(style, text)`` like
+    prompt toolkit's formatted text, where style is a class such as
+    ``class:rime.candidate``. Fragments of the highlighted candidate
+    have an extra class ``class:rime.highlighted``.
+    """
+
+    fragments: list[tuple[str, str]]
+
+    def __new__(cls, fragments: list[tuple[str, str]]) -> Self:
+        r"""New.
+
+        :param cls:
+        :param fragments:
+        :type fragments: list[tuple[str, str]]
+        :rtype: Self
+        """
+        line = str.__new__(cls, "".join([text for _, text in fragments]))
+        line.fragments = fragments
+        return line
+
+    @classmethod
+    def from_preedit(
+        cls,
+        preedit: str | None,
+        cursor_pos: int,
+        cursor: str,
+        indent: str = "",
+    ) -> Self:
+        r"""Draw preedit with a cursor.
+
+        :param cls:
+        :param preedit:
+        :type preedit: str | None
+        :param cursor_pos:
+        :type cursor_pos: int
+        :param cursor:
+        :type cursor: str
+        :param indent:
+        :type indent: str
+        :rtype: Self
+        """
+        if preedit is None:
+            preedit = ""
+        return cls([
+            ("", indent),
+            ("class:rime.preedit", preedit[:cursor_pos]),
+            ("class:rime.cursor", cursor),
+            ("class:rime.preedit", preedit[cursor_pos:]),
+        ])
+
+
+def unzip(
+    candidates: Sequence[Candidate],
+) -> tuple[tuple[str, ...], tuple[str | None, ...]]:
+    r"""Get texts and comments of candidates without creating ``Candidate``s
+    for ``Candidates``.
+
+    :param candidates:
+    :type candidates: Sequence[Candidate]
+    :rtype: tuple[tuple[str, ...], tuple[str | None, ...]]
+    """
+    if isinstance(candidates, Candidates):
+        return candidates.texts, candidates.comments
+    texts = tuple(candidate.text for candidate in candidates)
+    comments = tuple(candidate.comment for candidate in candidates)
+    return texts, comments
+
+
+def get_candidate_fragments(
+    index: str, text: str, comment: str | None, highlighted: bool
+) -> list[tuple[str, str]]:
+    r"""Get fragments of a candidate.
+
+    :param index:
+    :type index: str
+    :param text:
+    :type text: str
+    :param comment:
+    :type comment: str | None
+    :param highlighted:
+    :type highlighted: bool
+    :rtype: list[tuple[str, str]]
+    """
+    style = " class:rime.highlighted" if highlighted else ""
+    fragments = [
+        ("class:rime.index" + style, index),
+        ("class:rime.candidate" + style, " " + text),
+    ]
+    if comment:
+        fragments += [("class:rime.comment" + style, " " + comment)]
+    return fragments
+
+
 @dataclass
 class UI(ABC):
-    r"""UI."""
+    r"""UI.
+
+    ``render()`` caches at most ``cache_size`` results of ``draw()``.
+    ``hits`` and ``misses`` count the lookups of the cache.
+    """
+
+    cache_size: int = field(default=64, kw_only=True)
+    cache: dict[Hashable, tuple[tuple[str, ...], int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    hits: int = field(default=0, init=False, compare=False)
+    misses: int = field(default=0, init=False, compare=False)
+
+    @staticmethod
+    def get_key(context: Context) -> Hashable:
+        r"""Get the key of everything ``draw()`` depends on.
+
+        :param context:
+        :type context: Context
+        :rtype: Hashable
+        """
+        composition = context.composition
+        menu = context.menu
+        texts, comments = unzip(menu.candidates)
+        return (
+            composition.preedit,
+            composition.cursor_pos,
+            menu.page_no,
+            menu.is_last_page,
+            menu.highlighted_candidate_index,
+            menu.num_candidates,
+            texts,
+            comments,
+        )
+
+    def render(self, context: Context) -> tuple[tuple[str, ...], int]:
+        r"""Draw UI with cache.
+
+        :param self:
+        :param context:
+        :type context: Context
+        :rtype: tuple[tuple[str, ...], int]
+        """
+        key = self.get_key(context)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self.draw(context)
+        if len(self.cache) >= self.cache_size:
+            # drop the oldest result
+            del self.cache[next(iter(self.cache))]
+        self.cache[key] = result
+        return result
 
     @abstractmethod
     def draw(self, context: Context) -> tuple[tuple[str, ...], int]:
-        r"""Draw UI.
+        r"""Draw UI. Lines can be ``Line``s to be styled.
 
         :param self:
         :param context:
@@ -6,10 +6,9 @@ Refer <https://github.com/rimeinn/ime.nvim/blob/0.0.5/packages/ime/lua/ime/ui/ho
 
 from dataclasses import dataclass
 
-from wcwidth import wcswidth
-
 from .. import Context
-from . import STYLES, UI
+from ..width import wcswidth
+from . import STYLES, UI, Line, get_candidate_fragments, unzip
 
 
 @dataclass
@@ -23,53 +22,52 @@ class HorizontalUI(UI):
     right_sep: str = "]"
     cursor: str = "|"
 
-    def draw(self, context: Context) -> tuple[tuple[str, ...], int]:
+    def draw(self, context: Context) -> tuple[tuple[Line, ...], int]:
         r"""Draw UI.
 
         :param self:
         :param context:
         :type context: Context
-        :rtype: tuple[tuple[str, ...], int]
+        :rtype: tuple[tuple[Line, ...], int]
         """
-        if context.composition.preedit is None:
-            preedit = ""
-        else:
-            preedit = context.composition.preedit
-        preedit = (
-            preedit[0 : context.composition.cursor_pos]
-            + self.cursor
-            + preedit[context.composition.cursor_pos :]
-        )
-
-        candidates = context.menu.candidates
-        line = ""
-        indices = self.indices
-        for index, candidate in enumerate(candidates):
-            text = indices[index] + " " + candidate.text
-            if candidate.comment:
-                text = text + " " + candidate.comment
-            if context.menu.highlighted_candidate_index == index:
-                text = self.left_sep + text
-            elif context.menu.highlighted_candidate_index + 1 == index:
-                text = self.right_sep + text
-            else:
-                text = " " + text
-            line = line + text
-        if (
-            context.menu.num_candidates
-            == context.menu.highlighted_candidate_index + 1
+        menu = context.menu
+        highlighted = menu.highlighted_candidate_index
+        texts, comments = unzip(menu.candidates)
+        fragments = []
+        for index, (text, comment) in enumerate(
+            zip(texts, comments, strict=True)
         ):
-            line = line + self.right_sep
+            if highlighted == index:
+                sep = self.left_sep
+            elif highlighted + 1 == index:
+                sep = self.right_sep
+            else:
+                sep = " "
+            fragments += [("class:rime.separator", sep)]
+            fragments += get_candidate_fragments(
+                self.indices[index],
+                text,
+                comment,
+                highlighted == index,
+            )
+        if menu.num_candidates == highlighted + 1:
+            fragments += [("class:rime.separator", self.right_sep)]
         else:
-            line = line + " "
+            fragments += [("", " ")]
         col = 0
-        left = self.left
-        if context.menu.page_no != 0:
+        indent = ""
+        if menu.page_no != 0:
             num = wcswidth(self.left)
-            line = left + line
-            preedit = " " * num + preedit
+            fragments.insert(0, ("class:rime.page", self.left))
+            indent = " " * num
             col = col - num
-        if not context.menu.is_last_page and context.menu.num_candidates > 0:
-            line = line + self.right
+        if not menu.is_last_page and menu.num_candidates > 0:
+            fragments += [("class:rime.page", self.right)]
 
-        return (preedit, line), col
+        preedit = Line.from_preedit(
+            context.composition.preedit,
+            context.composition.cursor_pos,
+            self.cursor,
+            indent,
+        )
+        return (preedit, Line(fragments)), col
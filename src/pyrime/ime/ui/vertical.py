@@ -7,7 +7,7 @@ Refer <https://github.com/rimeinn/ime.nvim/blob/0.0.5/packages/ime/lua/ime/ui/ve
 from dataclasses import dataclass
 
 from .. import Context
-from . import STYLES, UI
+from . import STYLES, UI, Line, get_candidate_fragments, unzip
 
 
 @dataclass
@@ -19,35 +19,41 @@ class VerticalUI(UI):
     right_sep: str = "]"
     cursor: str = "|"
 
-    def draw(self, context: Context) -> tuple[tuple[str, ...], int]:
+    def draw(self, context: Context) -> tuple[tuple[Line, ...], int]:
         r"""Draw UI.
 
         :param self:
         :param context:
         :type context: Context
-        :rtype: tuple[tuple[str, ...], int]
+        :rtype: tuple[tuple[Line, ...], int]
         """
-        if context.composition.preedit is None:
-            preedit = ""
-        else:
-            preedit = context.composition.preedit
-        preedit = (
-            preedit[0 : context.composition.cursor_pos]
-            + self.cursor
-            + preedit[context.composition.cursor_pos :]
-        )
-
-        lines = (preedit,)
-        candidates = context.menu.candidates
-        indices = self.indices
-        for index, candidate in enumerate(candidates):
-            text = indices[index] + " " + candidate.text
-            if candidate.comment:
-                text = text + " " + candidate.comment
-            if context.menu.highlighted_candidate_index == index:
-                text = self.left_sep + text + self.right_sep
+        lines = [
+            Line.from_preedit(
+                context.composition.preedit,
+                context.composition.cursor_pos,
+                self.cursor,
+            )
+        ]
+        highlighted = context.menu.highlighted_candidate_index
+        texts, comments = unzip(context.menu.candidates)
+        for index, (text, comment) in enumerate(
+            zip(texts, comments, strict=True)
+        ):
+            if highlighted == index:
+                left, right = self.left_sep, self.right_sep
             else:
-                text = " " + text + " "
-            lines += (text,)
-
-        return lines, 0
+                left, right = " ", " "
+            lines += [
+                Line([
+                    ("class:rime.separator", left),
+                    *get_candidate_fragments(
+                        self.indices[index],
+                        text,
+                        comment,
+                        highlighted == index,
+                    ),
+                    ("class:rime.separator", right),
+                ])
+            ]
+
+        return tuple(lines), 0
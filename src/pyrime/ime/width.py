@@ -0,0 +1,43 @@
+r"""Width
+=========
+
+Display width of a string in a terminal, same as ``wcwidth.wcswidth()``.
+
+Printable ASCII and CJK strings are measured by ``len()``. Other strings,
+such as a line of candidates which is drawn again on every keystroke, are
+measured by ``wcwidth.wcswidth()`` and cached.
+"""
+
+import re
+from functools import lru_cache
+
+from wcwidth import wcswidth as _wcswidth
+
+# CJK unified ideographs, extension A and compatibility ideographs
+CJK = re.compile("[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]*")
+
+
+@lru_cache(maxsize=1024)
+def _cached_wcswidth(text: str) -> int:
+    r"""Cached wcswidth.
+
+    :param text:
+    :type text: str
+    :rtype: int
+    """
+    if CJK.fullmatch(text):
+        return 2 * len(text)
+    return _wcswidth(text)
+
+
+def wcswidth(text: str) -> int:
+    r"""Get the display width of a string.
+
+    :param text:
+    :type text: str
+    :return: -1 if any character isn't printable
+    :rtype: int
+    """
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return _cached_wcswidth(text)
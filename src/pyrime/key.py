@@ -18,7 +18,7 @@ with open(os.path.join(json_dir, "modifiers.json")) as f:
     modifiers: list = json.load(f)
 
 
-@dataclass
+@dataclass(frozen=True)
 class Key(
     KeyBase,
     key_map=key_map,
@@ -2,9 +2,11 @@ r"""Keymap
 ==========
 
 Refer <https://github.com/rimeinn/ime.nvim/blob/0.0.5/packages/ime/lua/ime/nvim/keymap.lua>
+
+Keymaps are set and deleted in bulk by one ``nvim_exec_lua()`` request.
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 
 from pynvim.api.common import RemoteApi
@@ -57,6 +59,29 @@ for i in 0x5C, 0x5F:
     for lhs in (f"<C-{keyname}>", f"<M-C-{keyname}>"):
         SPECIAL += (lhs,)
 
+# set keymaps of insert mode from a table of lhs to rhs, then delete
+# keymaps from a list of lhs. an error doesn't stop other keymaps. return
+# the lhs of keymaps failing to set and keymaps still mapped after failing
+# to delete
+SET_KEYMAPS = """
+local keymaps, lhss = ...
+local failed = {}
+for lhs, rhs in pairs(keymaps) do
+  if not pcall(vim.api.nvim_set_keymap, "i", lhs, rhs, {}) then
+    table.insert(failed, lhs)
+  end
+end
+for _, lhs in ipairs(lhss) do
+  if
+    not pcall(vim.api.nvim_del_keymap, "i", lhs)
+    and vim.fn.maparg(lhs, "i") ~= ""
+  then
+    table.insert(failed, lhs)
+  end
+end
+return failed
+"""
+
 
 @dataclass
 class Keymap:
@@ -79,13 +104,74 @@ class Keymap:
         :type callback: str | None | Callable[[str], str]
         :rtype: None
         """
-        if callback is None and lhs in self.maps:
-            self.api.del_keymap("i", lhs)
-            del self.maps[lhs]
-        elif callback and lhs not in self.maps:
-            rhs = callback if isinstance(callback, str) else callback(lhs)
-            self.api.set_keymap("i", lhs, rhs, {})
-            self.maps[lhs] = rhs
+        self.set_all((lhs,), callback)
+
+    def set_all(
+        self,
+        lhss: Iterable[str],
+        callback: str | None | Callable[[str], str],
+    ) -> None:
+        r"""Set or delete keymaps in one request.
+
+        :param lhss:
+        :type lhss: Iterable[str]
+        :param callback:
+        :type callback: str | None | Callable[[str], str]
+        :rtype: None
+        """
+        calls = self.get_calls(lhss, callback)
+        results = [self.api.exec_lua(*args) for _, args in calls]
+        self.set_results(calls, results)
+
+    def get_calls(
+        self,
+        lhss: Iterable[str],
+        callback: str | None | Callable[[str], str],
+    ) -> list[list]:
+        r"""Get calls of ``nvim_call_atomic()`` to set or delete keymaps.
+        Pass their results to ``set_results()`` to update ``maps``.
+
+        Only keymaps not in ``maps`` are set and only keymaps in ``maps``
+        are deleted.
+
+        :param lhss:
+        :type lhss: Iterable[str]
+        :param callback:
+        :type callback: str | None | Callable[[str], str]
+        :rtype: list[list]
+        """
+        keymaps: dict[str, str] = {}
+        deleted: list[str] = []
+        for lhs in lhss:
+            if callback is None and lhs in self.maps:
+                deleted += [lhs]
+            elif callback and lhs not in self.maps:
+                keymaps[lhs] = (
+                    callback if isinstance(callback, str) else callback(lhs)
+                )
+        if not (keymaps or deleted):
+            return []
+        return [["nvim_exec_lua", [SET_KEYMAPS, [keymaps, deleted]]]]
+
+    def set_results(self, calls: list[list], results: list) -> None:
+        r"""Update ``maps`` by the results of calls from ``get_calls()``.
+
+        :param calls:
+        :type calls: list[list]
+        :param results: the lhs of keymaps failing to change for every call
+        :type results: list
+        :rtype: None
+        """
+        for (_, (_, (keymaps, deleted))), result in zip(
+            calls, results, strict=True
+        ):
+            failed = set(result or ())
+            for lhs in deleted:
+                if lhs not in failed:
+                    del self.maps[lhs]
+            for lhs, rhs in keymaps.items():
+                if lhs not in failed:
+                    self.maps[lhs] = rhs
 
     def set_special(self, callback: None | Callable[[str], str]) -> None:
         r"""Set special.
@@ -94,8 +180,7 @@ class Keymap:
         :type callback: None | Callable[[str], str]
         :rtype: None
         """
-        for lhs in self.special:
-            self.set(lhs, callback)
+        self.set_all(self.special, callback)
 
     def set_nowait(self, is_enabled: bool) -> None:
         r"""Set nowait.
@@ -104,5 +189,4 @@ class Keymap:
         :type is_enabled: bool
         :rtype: None
         """
-        for lhs in self.nowait:
-            self.set(lhs, lhs if is_enabled else None)
+        self.set_all(self.nowait, (lambda lhs: lhs) if is_enabled else None)
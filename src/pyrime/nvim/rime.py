@@ -3,10 +3,12 @@ r"""Rime for Neovim
 
 Refer <https://github.com/rimeinn/rime.nvim/blob/main/lua/rime/nvim/rime.lua>
 
-TODO: cannot get ``v:char`` in pynvim. we must refer
-<http://github.com/rimeinn/coc-rime> to pass input character directly, which is
-troublesome. That is why this plugin is experimental and not recommended to use
-in product environment just as coc-rime.
+pynvim cannot get ``v:char``, so a Lua shim captures it by
+``InsertCharPre`` and special keys by keymaps when composing. Keys are
+sent to the plugin by ``rpcnotify()``. Keys typed before the response of
+the last keys are sent together after it, so fast typing doesn't wait for
+one request per key. The response inserts the committed text, updates
+keymaps and the window in one ``nvim_call_atomic()`` request.
 """
 
 from dataclasses import dataclass, field
@@ -14,11 +16,104 @@ from dataclasses import dataclass, field
 import pynvim
 from pynvim.api.nvim import Nvim
 
+from ..key import Key
 from ..rime import RimeBase
 from . import get_default_nvim
 from .keymap import Keymap
 from .win import Win
 
+# capture keys typed in insert mode when b:iminsert is true and send them
+# to the channel in batches. pyrime.done() inserts the text of the last
+# batch, feeds back special keys not processed by rime without remapping,
+# and sends the keys typed meanwhile. if the channel is closed, v:char is
+# kept. if no response comes before timeout, keys are sent again
+INPUT = """
+local channel, group = ...
+local uv = vim.uv or vim.loop
+-- milliseconds to wait for a response, in case the host has died
+local timeout = 1000
+local pyrime = { keys = {}, busy = false, time = 0 }
+_G.pyrime = pyrime
+
+local function send()
+  if #pyrime.keys == 0 then
+    return true
+  end
+  if pyrime.busy and uv.now() - pyrime.time < timeout then
+    return true
+  end
+  local keys = pyrime.keys
+  pyrime.keys = {}
+  pyrime.busy = pcall(vim.rpcnotify, channel, "pyrime_keys", keys)
+  pyrime.time = uv.now()
+  return pyrime.busy
+end
+
+-- return false if the key cannot be sent
+function pyrime.feed(key)
+  table.insert(pyrime.keys, key)
+  return send()
+end
+
+function pyrime.done(text, keys)
+  pyrime.busy = false
+  if text ~= "" then
+    pcall(vim.api.nvim_put, vim.split(text, "\\n"), "c", false, true)
+  end
+  if keys ~= "" then
+    keys = vim.api.nvim_replace_termcodes(keys, true, false, true)
+    pcall(vim.api.nvim_feedkeys, keys, "n", false)
+  end
+  send()
+end
+
+vim.api.nvim_create_autocmd("InsertCharPre", {
+  group = group,
+  callback = function()
+    local iminsert = vim.b.iminsert
+    if iminsert and iminsert ~= 0 and pyrime.feed(vim.v.char) then
+      vim.v.char = ""
+    end
+  end,
+})
+"""
+DONE = "pyrime.done(...)"
+# get the current buffer and the buffers whose b:iminsert is true
+GET_BUFFERS = """
+local buffers = {}
+for _, buf in ipairs(vim.api.nvim_list_bufs()) do
+  local iminsert = vim.b[buf].iminsert
+  if iminsert and iminsert ~= 0 then
+    table.insert(buffers, buf)
+  end
+end
+return { vim.api.nvim_get_current_buf(), buffers }
+"""
+
+
+def is_key(name: str) -> bool:
+    r"""Is a key name which can be parsed.
+
+    :param name:
+    :type name: str
+    :rtype: bool
+    """
+    try:
+        Key.new(name)
+    except (KeyError, NotImplementedError):
+        return False
+    return True
+
+
+def get_rhs(lhs: str) -> str:
+    r"""Get the rhs of a special keymap feeding the key to the shim.
+
+    :param lhs:
+    :type lhs: str
+    :rtype: str
+    """
+    return f"<Cmd>lua pyrime.feed([[{lhs.replace('<', '<lt>')}]])<CR>"
+
 
 @pynvim.plugin
 @dataclass
@@ -28,6 +123,10 @@ class Rime(RimeBase):
     Provide:
         vim function ``rime_set(v:true/v:false/v:null)``.
         vim command ``:Rime enable/disable/toggle``.
+
+    ``buffers`` mirrors the buffers whose ``b:iminsert`` is true. It is read
+    from neovim when the plugin starts, then ``b:iminsert`` must only be
+    changed by ``rime_set()`` or ``:Rime``.
     """
 
     vim: Nvim = field(default_factory=get_default_nvim)
@@ -35,37 +134,139 @@ class Rime(RimeBase):
     special: tuple[str, ...] = Keymap.special
     disable: tuple[str, ...] = Keymap.disable
     augroup_name: str = "rime"
+    buffers: set[int] = field(default_factory=set)
 
     def __post_init__(self) -> None:
         r"""Post init.
 
         :rtype: None
         """
-        self.win = Win(self.vim.api)
+        self.win = Win(self.vim.api, channel_id=self.vim.channel_id)
         self.keymap = Keymap(
-            self.vim.api, self.nowait, self.special, self.disable
+            self.vim.api,
+            self.nowait,
+            tuple(filter(is_key, self.special)),
+            self.disable,
         )
+        self.buf_id, buffers = self.vim.api.exec_lua(GET_BUFFERS, [])
+        self.buffers.update(buffers)
+        if self.is_enabled:
+            self.keymap.set_nowait(True)
         self.augroup_id = self.vim.api.create_augroup(self.augroup_name, {})
         self.create_autocmds(self.augroup_id)
 
     def create_autocmds(self, id: int):
         r"""Create autocmds.
 
-        TODO
+        ``BufEnter`` and ``BufDelete`` notify the buffer number, so which
+        buffer is current and whether it is enabled are known without any
+        request. ``InsertCharPre`` is created by the Lua shim.
 
         :param id:
         :type id: int
         """
+        for event, method in (
+            ("BufEnter", "pyrime_buf_enter"),
+            ("BufDelete", "pyrime_buf_delete"),
+        ):
+            self.vim.api.create_autocmd(
+                event,
+                {
+                    "group": id,
+                    "command": f"call rpcnotify({self.vim.channel_id}, "
+                    f"'{method}', str2nr(expand('<abuf>')))",
+                },
+            )
+        self.vim.api.exec_lua(INPUT, [self.vim.channel_id, id])
+
+    @pynvim.rpc_export("pyrime_buf_enter")
+    def buf_enter(self, buf_id: int) -> None:
+        r"""Buf enter.
+
+        :param buf_id:
+        :type buf_id: int
+        :rtype: None
+        """
+        self.buf_id = buf_id
+
+    @pynvim.rpc_export("pyrime_buf_delete")
+    def buf_delete(self, buf_id: int) -> None:
+        r"""Buf delete.
+
+        :param buf_id:
+        :type buf_id: int
+        :rtype: None
+        """
+        self.buffers.discard(buf_id)
 
-    def exe(self, input: str) -> None:  # type: ignore
-        r"""Exe.
+    @pynvim.rpc_export("pyrime_keys")
+    def exe(self, keys: list[str]) -> None:  # type: ignore
+        r"""Process keys sent by the Lua shim and respond in one request.
 
-        TODO
+        Keys are processed one by one, so a key not processed by rime
+        doesn't drop the following keys, and the text committed by every
+        key is inserted in order. A character not processed, or not parsed
+        by ``Key`` such as ``"\t"``, is inserted verbatim. A special key not
+        processed, such as ``<BS>`` typed after the composition is
+        committed, is fed back to neovim. The composition is rendered once
+        after all keys. The response is always sent, otherwise the Lua shim
+        waits for it forever.
 
-        :param input:
-        :type input: str
+        :param keys: ``v:char`` or names of special keys
+        :type keys: list[str]
         :rtype: None
         """
+        text = ""
+        feedkeys = ""
+        lines = self.win.lines
+        col = self.win.config.get("col", 0)
+        processed = False
+        try:
+            for name in keys:
+                try:
+                    key = Key.new(name)
+                except (KeyError, ValueError, NotImplementedError):
+                    text += name
+                    continue
+                if (
+                    self.session.is_maintenance_mode()
+                    or not self.session.process_key(*key)
+                ):
+                    # special keys have names such as "<BS>"
+                    if len(name) > 1:
+                        feedkeys += name
+                    else:
+                        text += name
+                    continue
+                processed = True
+                commit = self.session.get_commit()
+                if commit is not None:
+                    text += commit.text
+            if processed:
+                lines, col = (), 0
+                with self.session.get_context_view() as context:
+                    if context is not None and context.menu.num_candidates:
+                        lines, col = self.ui.render(context)
+        finally:
+            keymap_calls = self.keymap.get_calls(
+                self.keymap.special, get_rhs if lines else None
+            )
+            results = self.win.update(
+                lines,
+                col,
+                [["nvim_exec_lua", [DONE, [text, feedkeys]]], *keymap_calls],
+            )
+            self.keymap.set_results(keymap_calls, results[1:])
+
+    @pynvim.rpc_export("pyrime_win_closed")
+    def win_closed(self, win_id: int) -> None:
+        r"""Win closed.
+
+        :param win_id:
+        :type win_id: int
+        :rtype: None
+        """
+        self.win.closed(win_id)
 
     @pynvim.function("rime_set")
     def function(self, flag: bool | None) -> None:
@@ -96,11 +297,11 @@ class Rime(RimeBase):
 
     @property
     def is_enabled(self) -> bool:
-        r"""Is enabled.
+        r"""Is enabled for the current buffer. It doesn't request neovim.
 
         :rtype: bool
         """
-        return self.vim.current.buffer.vars.get("iminsert", False)
+        return self.buf_id in self.buffers
 
     @is_enabled.setter
     def is_enabled(self, enabled: bool) -> None:
@@ -110,6 +311,15 @@ class Rime(RimeBase):
         :type enabled: bool
         :rtype: None
         """
-        if self.vim.current.buffer.vars.get("iminsert", False) != enabled:
-            self.vim.current.buffer.vars["iminsert"] = enabled
+        if self.is_enabled != enabled:
+            if enabled:
+                self.buffers.add(self.buf_id)
+            else:
+                self.buffers.discard(self.buf_id)
+            # for statusline and the Lua shim
+            self.vim.api.buf_set_var(self.buf_id, "iminsert", enabled)
             self.keymap.set_nowait(enabled)
+            if not enabled:
+                self.session.clear_composition()
+                self.keymap.set_special(None)
+                self.win.update()
@@ -2,23 +2,34 @@ r"""Win
 =======
 
 Refer <https://github.com/rimeinn/ime.nvim/blob/0.0.5/packages/ime/lua/ime/nvim/win.lua>
+
+Every update is one ``nvim_call_atomic()`` request which only sends
+changed lines. Whether the window is valid is tracked by a ``WinClosed``
+autocmd notifying ``closed()``, so it isn't requested.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
 from pynvim.api.common import RemoteApi
-from wcwidth import wcswidth
+
+from ..ime.width import wcswidth
 
 
 @dataclass
 class Win:
-    r"""Win."""
+    r"""Win.
+
+    If ``channel_id`` is not ``0``, ``WinClosed`` notifies the channel with
+    the method ``"pyrime_win_closed"``, which should call ``closed()``.
+    """
 
     api: RemoteApi
     win_id: int = -1
     lines: tuple[str, ...] = ()
     config: dict[str, Any] = field(default_factory=dict)
+    channel_id: int = 0
 
     def __post_init__(self) -> None:
         r"""Post init.
@@ -26,6 +37,16 @@ class Win:
         :rtype: None
         """
         self.buf_id = self.api.create_buf(False, True)
+        # a new buffer has an empty line
+        self.buf_lines: tuple[str, ...] = ("",)
+        if self.channel_id:
+            self.api.create_autocmd(
+                "WinClosed",
+                {
+                    "command": f"call rpcnotify({self.channel_id}, "
+                    "'pyrime_win_closed', str2nr(expand('<amatch>')))"
+                },
+            )
 
     @property
     def is_valid(self) -> bool:
@@ -33,7 +54,7 @@ class Win:
 
         :rtype: bool
         """
-        return self.api.win_is_valid(self.win_id)
+        return self.win_id != -1
 
     @property
     def has_preedit(self) -> bool:
@@ -43,33 +64,106 @@ class Win:
         """
         return len(self.lines) > 1
 
-    def update(self, lines: tuple[str, ...] = (), col: int = 0) -> None:
+    def closed(self, win_id: int) -> None:
+        r"""Handle ``WinClosed``.
+
+        :param win_id:
+        :type win_id: int
+        :rtype: None
+        """
+        if win_id == self.win_id:
+            self.win_id = -1
+
+    def set_lines(self, lines: tuple[str, ...]) -> list[list]:
+        r"""Get calls to replace the changed lines of the buffer.
+
+        Only the lines between the common prefix and the common suffix of
+        ``buf_lines`` and ``lines`` are replaced.
+
+        :param lines:
+        :type lines: tuple[str, ...]
+        :rtype: list[list]
+        """
+        old = self.buf_lines
+        self.buf_lines = lines
+        size = min(len(old), len(lines))
+        start = 0
+        while start < size and old[start] == lines[start]:
+            start += 1
+        end = 0
+        while end < size - start and old[-end - 1] == lines[-end - 1]:
+            end += 1
+        if start == len(old) - end == len(lines) - end:
+            return []
+        return [
+            [
+                "nvim_buf_set_lines",
+                [
+                    self.buf_id,
+                    start,
+                    len(old) - end,
+                    False,
+                    list(lines[start : len(lines) - end]),
+                ],
+            ]
+        ]
+
+    def update(
+        self,
+        lines: tuple[str, ...] = (),
+        col: int = 0,
+        calls: Sequence[list] = (),
+    ) -> list:
         r"""Update.
 
         :param lines:
         :type lines: tuple[str, ...]
         :param col:
         :type col: int
-        :rtype: None
+        :param calls: other calls to send in the same request before
+            updating the window
+        :type calls: Sequence[list]
+        :return: the results of ``calls``
+        :rtype: list
         """
         self.lines = lines
-        width = max(wcswidth(line) for line in lines)
+        number = len(calls)
+        calls = list(calls)
+        if len(lines) == 0:
+            if self.is_valid:
+                calls += [["nvim_win_close", [self.win_id, False]]]
+                self.win_id = -1
+            if not calls:
+                return []
+            results, error = self.api.call_atomic(calls)
+            # the window can be closed before WinClosed is notified
+            if error is not None and error[0] < number:
+                raise RuntimeError(error[2])
+            return results[:number]
         self.config = {
             "relative": "cursor",
-            "height": len(self.lines),
+            "height": len(lines),
             "style": "minimal",
-            "width": width,
+            "width": max(wcswidth(line) for line in lines),
             "row": 1,
             "col": col,
         }
-        if len(self.lines) == 0:
-            if self.is_valid:
-                self.api.win_close(self.win_id, False)
-            return
-        self.api.buf_set_lines(
-            self.buf_id, 0, len(self.lines), False, self.lines
-        )
+        buf_lines = self.buf_lines
+        calls += self.set_lines(lines)
         if self.is_valid:
-            self.api.win_set_config(self.win_id, self.config)
+            calls += [["nvim_win_set_config", [self.win_id, self.config]]]
         else:
+            calls += [["nvim_open_win", [self.buf_id, False, self.config]]]
+        results, error = self.api.call_atomic(calls)
+        if error is None:
+            if not self.is_valid:
+                self.win_id = results[-1]
+            return results[:number]
+        # the window is closed before WinClosed is notified
+        if error[0] == len(calls) - 1 and self.is_valid:
             self.win_id = self.api.open_win(self.buf_id, False, self.config)
+            return results[:number]
+        if error[0] < len(calls) - 1:
+            # nvim_call_atomic() stops at the error
+            self.buf_lines = buf_lines
+        raise RuntimeError(error[2])
@@ -7,6 +7,7 @@ Refer
 
 from typing import TYPE_CHECKING
 
+from prompt_toolkit.filters.base import Condition
 from prompt_toolkit.key_binding.key_bindings import KeyBindings
 from prompt_toolkit.key_binding.key_processor import KeyPressEvent
 from prompt_toolkit.keys import ALL_KEYS, Keys
@@ -71,6 +72,13 @@ def load_rime_bindings(
 ) -> KeyBindings:
     r"""Load rime bindings.
 
+    Instead of one binding per key, two catch-all bindings ``<any>`` and
+    ``<escape> <any>`` dispatch keys. ``keys_set`` is converted to ``Key``s
+    once. A key is sent to rime if it is in ``keys_set`` and either it is a
+    character when rime is enabled or preedit is available. When preedit is
+    available, the bindings are eager to override other key bindings,
+    except a lone ``<escape>`` which can be a prefix of ``<escape> <any>``.
+
     :param rime:
     :type rime: IME
     :param keys_set:
@@ -79,24 +87,128 @@ def load_rime_bindings(
     """
     key_bindings = KeyBindings()
     handle = key_bindings.add
-
+    table: dict[tuple[Keys | str, ...], Key] = {}
     for keys in keys_set:
+        try:
+            table[keys] = Key.new(pt_key_name(keys))
+        except (NotImplementedError, KeyError):
+            # such as mouse events
+            continue
+    # key_buffer is recreated when key_processor is reset
+    key_processor = rime.app.key_processor
+    replaying = False
+
+    @Condition
+    def key_available() -> bool:
+        r"""Whether rime processes ``<any>``.
+
+        :rtype: bool
+        """
+        keys = (key_processor.key_buffer[0].key,)
+        if replaying or keys not in table:
+            return False
+        return rime.has_preedit or (rime.is_enabled and len(keys[0]) == 1)
+
+    @Condition
+    def key_eager() -> bool:
+        r"""Whether ``<any>`` overrides other key bindings.
+
+        :rtype: bool
+        """
+        return (
+            rime.has_preedit and key_processor.key_buffer[0].key != Keys.Escape
+        )
+
+    @Condition
+    def escape_key_available() -> bool:
+        r"""Whether rime processes ``<escape> <any>``.
+
+        When only ``<escape>`` is pressed, wait for the next key.
+
+        :rtype: bool
+        """
+        key_buffer = key_processor.key_buffer
+        if replaying:
+            return False
+        if len(key_buffer) < 2:
+            return rime.has_preedit
+        keys = (Keys.Escape, key_buffer[1].key)
+        return keys in table and rime.has_preedit
+
+    @handle(Keys.Any, filter=key_available, eager=key_eager)
+    @handle(
+        Keys.Escape,
+        Keys.Any,
+        filter=escape_key_available,
+        eager=rime.preedit_available,
+    )
+    def _(event: KeyPressEvent) -> object:
+        r""".
+
+        Inserting text invalidates the application by itself. If the layout
+        isn't changed either, return ``NotImplemented`` to not invalidate
+        the application.
+
+        When the worker is busy, keys are sent to rime to keep their order.
+        If rime doesn't process such a key, replay it to other key bindings.
+
+        :param event:
+        :type event: KeyPressEvent
+        :rtype: object
+        """
+        keys = tuple(key_press.key for key_press in event.key_sequence)
+        key = table[keys]
+        replay = rime.is_busy and not (len(keys) == 1 == len(keys[0]))
 
-        @handle(*keys, filter=rime.keys_available(keys))
-        def _(
-            event: KeyPressEvent, keys: tuple[Keys | str, ...] = keys
-        ) -> None:
-            r""".
+        def insert(text: str) -> None:
+            r"""Insert text.
 
-            :param event:
-            :type event: KeyPressEvent
-            :param keys:
-            :type keys: tuple[Keys | str, ...]
+            :param text:
+            :type text: str
             :rtype: None
             """
-            rime.exe(
-                lambda text: event.cli.current_buffer.insert_text(text),
-                Key.new(pt_key_name(keys)),
-            )
+            event.cli.current_buffer.insert_text(text)
+
+        if replay and rime.worker is not None:
+
+            def process() -> tuple[str, tuple[str, ...], int] | None:
+                r"""Process the key on the worker thread.
+
+                :rtype: tuple[str, tuple[str, ...], int] | None
+                """
+                if (
+                    rime.session.is_maintenance_mode()
+                    or not rime.session.process_key(*key)
+                ):
+                    return None
+                return rime.draw()
+
+            def done(result: tuple[str, tuple[str, ...], int] | None) -> None:
+                r"""Update the layout or replay the key.
+
+                :param result:
+                :type result: tuple[str, tuple[str, ...], int] | None
+                :rtype: None
+                """
+                nonlocal replaying
+                if result is not None:
+                    rime.update(insert, result)
+                    rime.app.invalidate()
+                    return
+                replaying = True
+                try:
+                    key_processor.feed_multiple(event.key_sequence, first=True)
+                    key_processor.process_keys()
+                finally:
+                    replaying = False
+
+            rime.worker.submit(process, done)
+            return None
+
+        skipped = rime.layout.skipped
+        rime.exe(insert, key)
+        if rime.layout.skipped > skipped:
+            return NotImplemented
+        return None
 
     return key_bindings
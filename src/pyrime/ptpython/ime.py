@@ -5,14 +5,15 @@ r"""Rime for Prompt Toolkit
 
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import partial
 
 from prompt_toolkit.filters.app import emacs_insert_mode, vi_insert_mode
 from prompt_toolkit.filters.base import Condition, Filter
 from prompt_toolkit.key_binding.key_bindings import merge_key_bindings
-from prompt_toolkit.keys import Keys
 
 from ..key import Key
-from ..rime import RimeBase
+from ..rime import LazySession, RimeBase
+from ..worker import Worker
 from .bindings import load_key_bindings
 from .layout import RimeLayout
 
@@ -24,17 +25,25 @@ class _IME:
 
 @dataclass
 class IME(RimeBase, _IME):
-    r"""Rime for prompt toolkit."""
+    r"""Rime for prompt toolkit.
+
+    If ``worker`` is not ``None``, keys are processed in order on its thread
+    and the layout is updated when results are posted back.
+    """
 
     iminsert: bool = False
+    worker: Worker | None = None
 
     def __post_init__(self) -> None:
         r"""Post init.
 
         :rtype: None
         """
-        self.back_layout = self.layout
         self.app = self.layout.app
+        self.app.layout = self.layout
+        # create session in the background when the application starts
+        if isinstance(self.session, LazySession):
+            self.app.pre_run_callables += [self.session.start]
         self.app.key_bindings = merge_key_bindings(
             ([self.app.key_bindings] if self.app.key_bindings else [])
             + [load_key_bindings(self)]
@@ -50,7 +59,37 @@ class IME(RimeBase, _IME):
         :type keys: Key
         :rtype: None
         """
-        text, lines, col = self.draw(*keys)
+        if self.worker is None:
+            self.update(callback, self.draw(*keys))
+            return
+
+        def _(result: tuple[str, tuple[str, ...], int]) -> None:
+            r""".
+
+            :param result:
+            :type result: tuple[str, tuple[str, ...], int]
+            :rtype: None
+            """
+            self.update(callback, result)
+            self.app.invalidate()
+
+        self.worker.submit(partial(self.draw, *keys), _)
+
+    def update(
+        self,
+        callback: Callable[[str], None],
+        result: tuple[str, tuple[str, ...], int],
+    ) -> None:
+        r"""Insert text and update layout by the result of ``draw()``.
+
+        :param self:
+        :param callback:
+        :type callback: Callable[[str], None]
+        :param result:
+        :type result: tuple[str, tuple[str, ...], int]
+        :rtype: None
+        """
+        text, lines, col = result
         # insert text before calculating cursor position
         callback(text)
         self.layout.update(lines, col)
@@ -76,57 +115,38 @@ class IME(RimeBase, _IME):
             or not (emacs_insert_mode | vi_insert_mode)()
         ):
             return
-        self.back_layout, self.app.layout = self.app.layout, self.back_layout
+        self.layout.visible = enabled
         self.layout.update()
+        if self.worker is not None:
+            # don't clear composition when the worker is processing keys
+            if enabled:
+                self.load_session()
+            else:
+                self.worker.submit(self.session.clear_composition)
+            self.enabled = enabled
+            return
         fset = RimeBase.is_enabled.fset
         if fset:
             fset(self, enabled)
 
     @property
-    def rime_available(self) -> Condition:
-        r"""Filter. Only when ``preedit`` is not available, key binding works.
-
-        :rtype: Filter
-        """
-
-        @Condition
-        def _() -> bool:
-            r""".
+    def is_busy(self) -> bool:
+        r"""Whether the worker has keys not processed.
 
-            :rtype: bool
-            """
-            return self.is_enabled
-
-        return _
-
-    @staticmethod
-    def keys_is_a_char(keys: tuple[Keys | str, ...]) -> Condition:
-        r"""Mode.
-
-        :param keys:
-        :type keys: tuple[Keys | str, ...]
-        :rtype: Condition
+        :rtype: bool
         """
-
-        @Condition
-        def _(keys: tuple[Keys | str, ...] = keys) -> bool:
-            r""".
-
-            :param keys:
-            :type keys: tuple[Keys | str, ...]
-            :rtype: bool
-            """
-            return len(keys) == 1 == len(keys[0])
-
-        return _
+        return self.worker is not None and self.worker.pending > 0
 
     @property
     def has_preedit(self) -> bool:
         r"""Has preedit.
 
+        When the worker is busy, preedit is unknown. Assume it is available
+        to send keys to rime in order.
+
         :rtype: bool
         """
-        return (
+        return self.is_busy or (
             isinstance(self.layout.window.height, int)
             and self.layout.window.height > 1
         )
@@ -156,15 +176,3 @@ class IME(RimeBase, _IME):
         """
 
         return (emacs_insert_mode | vi_insert_mode) & ~self.preedit_available
-
-    def keys_available(self, keys) -> Filter:
-        r"""Filter.
-
-        :param keys:
-        :type keys: tuple[Keys | str, ...]
-        :rtype: Filter
-        """
-
-        return (
-            self.keys_is_a_char(keys) & self.rime_available
-        ) | self.preedit_available
@@ -2,46 +2,73 @@ r"""Layout
 ==========
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from dataclasses import dataclass, field
 
 from prompt_toolkit.application import Application
 from prompt_toolkit.application.current import get_app
-from prompt_toolkit.buffer import Buffer
-from prompt_toolkit.formatted_text.base import AnyFormattedText
+from prompt_toolkit.filters.base import Condition
+from prompt_toolkit.formatted_text.base import (
+    AnyFormattedText,
+    StyleAndTextTuples,
+)
 from prompt_toolkit.layout.containers import (
+    ConditionalContainer,
     Float,
     FloatContainer,
     Window,
 )
-from prompt_toolkit.layout.controls import BufferControl
+from prompt_toolkit.layout.controls import FormattedTextControl
 from prompt_toolkit.layout.layout import Layout
 from prompt_toolkit.widgets import Frame
-from wcwidth import wcswidth
 
+from ..ime.width import wcswidth
 from .formatted_text import formatted_text
 
 
 @dataclass
 class RimeLayout(Layout):
-    r"""Rimelayout."""
+    r"""Rimelayout.
+
+    ``update()`` is skipped when lines and col are same as the last time.
+    ``updated`` and ``skipped`` count them.
+
+    Lines are displayed by their fragments if they are ``Line``s. The window
+    has a style class ``class:rime``.
+
+    The float is always mounted and only displayed when ``visible`` is true,
+    so showing or hiding it doesn't replace the application's layout.
+    """
 
     app: Application = field(default_factory=get_app)
     get_input_prompt: Callable[[], AnyFormattedText] = lambda: ""
-    content: BufferControl = field(default_factory=BufferControl)
+    content: FormattedTextControl = field(default_factory=FormattedTextControl)
+    # the input prompt is rendered again only when the key changes
+    get_prompt_key: Callable[[], Hashable] | None = None
+    prompt_key: Hashable = field(default=None, init=False)
+    prompt_width: int = field(default=0, init=False)
+    last: tuple[tuple[str, ...], int] | None = field(default=None, init=False)
+    updated: int = field(default=0, init=False)
+    skipped: int = field(default=0, init=False)
+    visible: bool = False
 
     def __post_init__(self) -> None:
         r"""Post init.
 
         :rtype: None
         """
-        self.window = Window(self.content)
-        self.float = Float(Frame(self.window))
+        self.window = Window(self.content, style="class:rime")
+        self.float = Float(
+            ConditionalContainer(
+                Frame(self.window), Condition(lambda: self.visible)
+            )
+        )
         super().__init__(
             FloatContainer(
                 self.app.layout.container,
                 [self.float],
-            )
+            ),
+            self.app.layout.current_window,
         )
 
     def move(self, left: int, top: int) -> None:
@@ -77,26 +104,62 @@ class RimeLayout(Layout):
         :type col: int
         :rtype: None
         """
-        self.content.buffer.text = "\n".join(lines)
+        if self.last == (lines, col):
+            self.skipped += 1
+            return
+        self.last = lines, col
+        self.updated += 1
+        self.content.text = self.get_fragments(lines)
         self.resize(
             (max(wcswidth(line) for line in lines) if len(lines) > 0 else 0),
             len(lines),
         )
-        buffer = self.app.layout.current_buffer
-        left, top = self.calculate_cursor(buffer) if buffer else (0, 0)
+        left, top = self.calculate_cursor(self.app.layout.current_window)
         left += col
-        left += wcswidth(formatted_text(self.get_input_prompt()))
+        left += self.get_prompt_width()
         self.move(left, top)
 
     @staticmethod
-    def calculate_cursor(buffer: Buffer) -> tuple[int, int]:
-        r"""Calculate the cursor position of a buffer.
+    def get_fragments(lines: tuple[str, ...]) -> StyleAndTextTuples:
+        r"""Join fragments of lines.
+
+        :param lines:
+        :type lines: tuple[str, ...]
+        :rtype: StyleAndTextTuples
+        """
+        fragments: StyleAndTextTuples = []
+        for i, line in enumerate(lines):
+            if i > 0:
+                fragments += [("", "\n")]
+            fragments += getattr(line, "fragments", [("", line)])
+        return fragments
+
+    def get_prompt_width(self) -> int:
+        r"""Get the width of the input prompt.
+
+        :rtype: int
+        """
+        key = None if self.get_prompt_key is None else self.get_prompt_key()
+        if key is None or key != self.prompt_key:
+            self.prompt_width = wcswidth(
+                formatted_text(self.get_input_prompt())
+            )
+            self.prompt_key = key
+        return self.prompt_width
+
+    @staticmethod
+    def calculate_cursor(window: Window) -> tuple[int, int]:
+        r"""Calculate the position under the cursor of a window.
+
+        Use the cursor position of the last rendering, which has considered
+        wrapped lines and scrolling, rather than scanning the text before
+        the cursor. Composing doesn't move the cursor, so it is up to date.
 
-        :param buffer:
-        :type buffer: Buffer
+        :param window:
+        :type window: Window
         :rtype: tuple[int, int]
         """
-        lines = buffer.text[: buffer.cursor_position].splitlines()
-        top = len(lines)
-        left = wcswidth(lines[-1]) if top > 0 else 0
-        return left, top
+        if window.render_info is None:
+            return 0, 0
+        cursor = window.render_info.cursor_position
+        return cursor.x, cursor.y + 1
@@ -29,5 +29,12 @@ class Rime(IME, _Rime):
 
         :rtype: None
         """
-        self.layout = RimeLayout(self.repl.app, self.repl.get_input_prompt)
+        self.layout = RimeLayout(
+            self.repl.app,
+            self.repl.get_input_prompt,
+            get_prompt_key=lambda: (
+                self.repl.current_statement_index,
+                self.repl.prompt_style,
+            ),
+        )
         super().__post_init__()
@@ -5,8 +5,12 @@ Refer <https://github.com/rimeinn/rime.nvim/blob/main/lua/rime/rime.lua>
 """
 
 import logging
+from array import array
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
 
 from .ime.ime import IMEBase
 from .ime.ui import UI
@@ -31,31 +35,96 @@ def get_session() -> SessionBase:
     return cls()
 
 
+@dataclass
+class LazySession:
+    r"""A session created on a background thread.
+
+    ``start()`` starts creating a session by ``factory``. ``session`` waits
+    for it only if it isn't ready, and starts creating it if it isn't
+    started. Other attributes are ``session``'s.
+    """
+
+    factory: Callable[[], SessionBase] = get_session
+    future: "Future[SessionBase] | None" = field(default=None, init=False)
+    lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def start(self) -> None:
+        r"""Start creating a session if it isn't started.
+
+        :param self:
+        :rtype: None
+        """
+        with self.lock:
+            if self.future is not None:
+                return
+            executor = ThreadPoolExecutor(1, "pyrime")
+            self.future = executor.submit(self.factory)
+            executor.shutdown(wait=False)
+
+    @property
+    def session(self) -> SessionBase:
+        r"""Session.
+
+        :param self:
+        :rtype: SessionBase
+        """
+        self.start()
+        if self.future is None:
+            raise RuntimeError("session is not started")
+        return self.future.result()
+
+    def __getattr__(self, name: str) -> Any:
+        r"""Get an attribute of ``session``.
+
+        :param self:
+        :param name:
+        :type name: str
+        :rtype: Any
+        """
+        # avoid recursion when fields don't exist, such as in ``copy()``
+        if name.startswith("__") or name in {"factory", "future", "lock"}:
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+
 @dataclass
 class RimeBase(IMEBase):
     r"""Base for ``Rime``.
 
-    Provides ``draw()``.
+    Provides ``draw()``. ``session`` is created when rime is enabled the
+    first time, or when ``session.start()`` is called.
     """
 
-    session: SessionBase = field(default_factory=get_session)
+    session: SessionBase | LazySession = field(default_factory=LazySession)
     ui: UI = field(default_factory=HorizontalUI)
     enabled: bool = False
 
     def draw(self, *keys: Key) -> tuple[str, tuple[str, ...], int]:
-        r"""Wrap ``UI.draw()``.
+        r"""Wrap ``UI.render()``.
+
+        A printable character not processed by rime, or typed when librime
+        is deploying, is passed through. Other keys are dropped.
 
         :param keys:
         :type keys: Key
         :rtype: tuple[str, tuple[str, ...], int]
         """
-        for key in keys:
-            if not self.session.process_key(*key):
-                return str(key), (), 0
-        context = self.session.get_context()
-        if context is None or context.menu.num_candidates == 0:
-            return self.session.get_commit_text(), (), 0
-        lines, col = self.ui.draw(context)
+        if self.session.is_maintenance_mode():
+            return "".join(key.char for key in keys), (), 0
+        if len(keys) == 1:
+            if not self.session.process_key(*keys[0]):
+                return keys[0].char, (), 0
+        elif len(keys) > 1:
+            index = self.session.process_keys(
+                array("i", [key.basic for key in keys]),
+                array("i", [key.modifier for key in keys]),
+            )
+            if index < len(keys):
+                return keys[index].char, (), 0
+        with self.session.get_context_view() as context:
+            if context is None or context.menu.num_candidates == 0:
+                return self.session.get_commit_text(), (), 0
+            lines, col = self.ui.render(context)
         return "", lines, col
 
     def exe(self, callback: Callable[[str], None], *keys: Key) -> None:
@@ -76,8 +145,20 @@ class RimeBase(IMEBase):
     def is_enabled(self) -> bool:
         return self.enabled
 
+    def load_session(self) -> SessionBase:
+        r"""Replace a ``LazySession`` with its session.
+
+        :param self:
+        :rtype: SessionBase
+        """
+        if isinstance(self.session, LazySession):
+            self.session = self.session.session
+        return self.session
+
     @is_enabled.setter
     def is_enabled(self, enabled: bool) -> None:
-        if not enabled:
+        if enabled:
+            self.load_session()
+        else:
             self.session.clear_composition()
         self.enabled = enabled
@@ -0,0 +1,20 @@
+# librime's function pointers in rime_api.pxd generated by autopxd are not
+# declared ``nogil``. Cast them to these types to release the GIL.
+from rime_api cimport Bool, RimeContext, RimeSessionId, RimeTraits
+
+ctypedef Bool (*process_key_t)(
+    RimeSessionId session_id, int keycode, int mask
+) noexcept nogil
+ctypedef Bool (*simulate_key_sequence_t)(
+    RimeSessionId session_id, const char* key_sequence
+) noexcept nogil
+ctypedef Bool (*get_context_t)(
+    RimeSessionId session_id, RimeContext* context
+) noexcept nogil
+ctypedef void (*finalize_t)() noexcept nogil
+ctypedef Bool (*start_maintenance_t)(Bool full_check) noexcept nogil
+ctypedef void (*join_maintenance_thread_t)() noexcept nogil
+ctypedef Bool (*deploy_t)() noexcept nogil
+ctypedef void (*setup_t)(RimeTraits* traits) noexcept nogil
+ctypedef void (*initialize_t)(RimeTraits* traits) noexcept nogil
+ctypedef RimeSessionId (*create_session_t)() noexcept nogil
@@ -0,0 +1,178 @@
+r"""Runtime
+===========
+
+librime is a process-wide library. ``setup()``, ``initialize()`` and
+``finalize()`` affect all sessions, so they are called by one
+reference-counted runtime shared by all sessions.
+
+Deployment, such as rebuilding dictionaries after they are changed, runs
+in librime's maintenance thread by ``Runtime.deploy()``. Poll
+``Runtime.is_deploying`` or await ``Runtime.wait()`` for its completion.
+Keys are not processed until it finishes.
+"""
+
+import logging
+from asyncio import to_thread
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .api import API, Traits
+    from .session import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Runtime:
+    r"""A reference-counted librime runtime.
+
+    librime is initialized when the first session acquires it and finalized
+    when the last session releases it.
+    """
+
+    traits: "Traits | None" = None
+    api: "API | None" = None
+    count: int = 0
+    lock: RLock = field(default_factory=RLock)
+    status: str = ""
+    handlers: list[Callable[[int, str, str], object]] = field(
+        default_factory=list
+    )
+
+    def acquire(self, traits: "Traits | None" = None) -> "API":
+        r"""Acquire. Initialize librime if it is the first acquirement.
+
+        :param self:
+        :param traits:
+        :type traits: Traits | None
+        :rtype: API
+        """
+        with self.lock:
+            if self.api is None:
+                from .api import API
+
+                self.api = API()
+            if self.count == 0:
+                if traits is not None:
+                    self.traits = traits
+                if self.traits is None:
+                    from .api import Traits
+
+                    self.traits = Traits()
+                self.api.setup(self.traits)
+                self.api.set_notification_handler(self.notify)
+                self.api.initialize(self.traits)
+            elif traits is not None and traits != self.traits:
+                logger.warning(
+                    "librime has been initialized by %s, ignore %s",
+                    self.traits,
+                    traits,
+                )
+            self.count += 1
+            return self.api
+
+    def release(self) -> None:
+        r"""Release. Finalize librime if it is the last release.
+
+        :param self:
+        :rtype: None
+        """
+        with self.lock:
+            if self.count == 0 or self.api is None:
+                return
+            self.count -= 1
+            if self.count == 0:
+                self.api.finalize()
+
+    def notify(
+        self, session_id: int, message_type: str, message_value: str
+    ) -> None:
+        r"""Handle a notification of librime.
+
+        It is called from librime's maintenance thread. ``status`` is the
+        last value of ``"deploy"``, such as ``"start"``, ``"success"`` and
+        ``"failure"``. Then notifications are passed to ``handlers``.
+
+        :param self:
+        :param session_id:
+        :type session_id: int
+        :param message_type:
+        :type message_type: str
+        :param message_value:
+        :type message_value: str
+        :rtype: None
+        """
+        if message_type == "deploy":
+            self.status = message_value
+            logger.info("deploy %s", message_value)
+        for handler in self.handlers:
+            handler(session_id, message_type, message_value)
+
+    def deploy(self, full_check: bool = False) -> bool:
+        r"""Start deployment in the background.
+
+        :param self:
+        :param full_check: deploy even if no file is modified
+        :type full_check: bool
+        :return: whether deployment is started
+        :rtype: bool
+        """
+        with self.lock:
+            if self.count == 0 or self.api is None:
+                raise RuntimeError("librime is not initialized")
+            started = self.api.start_maintenance(full_check)
+            if started:
+                self.status = "start"
+            return started
+
+    @property
+    def is_deploying(self) -> bool:
+        r"""Is deploying.
+
+        :param self:
+        :rtype: bool
+        """
+        return self.api is not None and self.api.is_maintenance_mode()
+
+    def join(self) -> None:
+        r"""Wait for deployment. The GIL is released when waiting.
+
+        :param self:
+        :rtype: None
+        """
+        if self.api is not None:
+            self.api.join_maintenance_thread()
+
+    async def wait(self) -> str:
+        r"""Await deployment without blocking the event loop.
+
+        :param self:
+        :return: ``status``
+        :rtype: str
+        """
+        await to_thread(self.join)
+        return self.status
+
+    def create_session(self) -> "Session":
+        r"""Create a session sharing this runtime.
+
+        :param self:
+        :rtype: Session
+        """
+        from .session import Session
+
+        return Session(runtime=self)
+
+
+runtime = Runtime()
+
+
+def get_runtime() -> Runtime:
+    r"""Get the process-wide runtime.
+
+    :rtype: Runtime
+    """
+    return runtime
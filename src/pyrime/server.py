@@ -0,0 +1,347 @@
+r"""Server
+==========
+
+A daemon owning one librime runtime for many processes. Start it by
+``python -m pyrime serve``, then use ``pyrime.client.RemoteSession`` as a
+session.
+
+Every message is a 4-byte big-endian length followed by compact JSON. A
+request is ``[method, *params]``. A response is ``[0, result]``, or
+``[1, error]`` if the method raises an exception. Every connection owns
+one session taken from a pool, which is reused by the next connection
+after the connection is closed.
+"""
+
+import json
+import logging
+import os
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from socket import AF_UNIX, SOCK_STREAM, socket
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from stat import S_ISSOCK
+from struct import Struct
+from threading import Lock
+from typing import IO, Any
+
+from platformdirs import user_runtime_dir
+
+from .ime import Candidates, Composition, Context, Menu
+from .ime.ui import unzip
+from .rime import get_session
+from .utils import SessionBase
+
+logger = logging.getLogger(__name__)
+HEADER = Struct("!I")
+# refuse larger messages rather than allocating memory for them
+MAX_SIZE = 1 << 24
+METHODS = {
+    "process_key",
+    "process_keys",
+    "process_keys_context",
+    "is_maintenance_mode",
+    "simulate",
+    "get_context",
+    "get_commit",
+    "get_current_schema",
+    "get_schema_list",
+    "select_schema",
+    "commit_composition",
+    "clear_composition",
+    "get_commit_text",
+}
+
+
+def get_socket_path() -> str:
+    r"""Get the default socket path.
+
+    :rtype: str
+    """
+    return os.path.join(user_runtime_dir("pyrime"), "pyrime.sock")
+
+
+def send(sock: socket, message: Any) -> None:
+    r"""Send a message.
+
+    :param sock:
+    :type sock: socket
+    :param message:
+    :type message: Any
+    :rtype: None
+    """
+    data = json.dumps(
+        message, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def recv(file: IO[bytes]) -> Any:
+    r"""Receive a message.
+
+    :param file: a buffered reader of a socket
+    :type file: IO[bytes]
+    :return: ``None`` if the connection is closed
+    :rtype: Any
+    """
+    header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_SIZE:
+        raise ValueError(f"message of {size} bytes is too large")
+    data = file.read(size)
+    if len(data) < size:
+        return None
+    return json.loads(data)
+
+
+def dump_context(context: Context | None) -> list | None:
+    r"""Convert a context to JSON.
+
+    :param context:
+    :type context: Context | None
+    :rtype: list | None
+    """
+    if context is None:
+        return None
+    composition, menu = context.composition, context.menu
+    return [
+        [
+            composition.length,
+            composition.cursor_pos,
+            composition.sel_start,
+            composition.sel_end,
+            composition.preedit,
+        ],
+        [
+            menu.page_size,
+            menu.page_no,
+            menu.is_last_page,
+            menu.highlighted_candidate_index,
+            menu.num_candidates,
+            menu.select_keys,
+            *unzip(menu.candidates),
+        ],
+    ]
+
+
+def load_context(data: list | None) -> Context | None:
+    r"""Convert JSON to a context.
+
+    :param data:
+    :type data: list | None
+    :rtype: Context | None
+    """
+    if data is None:
+        return None
+    composition, menu = data
+    *menu, texts, comments = menu
+    return Context(
+        Composition(*composition),
+        Menu(*menu, Candidates(tuple(texts), tuple(comments))),
+    )
+
+
+@dataclass
+class Handler:
+    r"""Call methods of a session for a connection."""
+
+    session: SessionBase
+    lock: Lock
+
+    def process_keys(self, keycodes: list[int], masks: list[int]) -> int:
+        r"""Process keys.
+
+        :param self:
+        :param keycodes:
+        :type keycodes: list[int]
+        :param masks:
+        :type masks: list[int]
+        :rtype: int
+        """
+        return self.session.process_keys(
+            array("i", keycodes), array("i", masks)
+        )
+
+    def process_keys_context(
+        self, keycodes: list[int], masks: list[int]
+    ) -> tuple[int, list | None, bool]:
+        r"""Process keys and get context in one round trip.
+
+        :param self:
+        :param keycodes:
+        :type keycodes: list[int]
+        :param masks:
+        :type masks: list[int]
+        :return: the index of the first unprocessed key, context and
+            whether librime is deploying
+        :rtype: tuple[int, list | None, bool]
+        """
+        index = self.process_keys(keycodes, masks)
+        return (
+            index,
+            dump_context(self.session.get_context()),
+            self.session.is_maintenance_mode(),
+        )
+
+    def get_context(self) -> list | None:
+        r"""Get context.
+
+        :param self:
+        :rtype: list | None
+        """
+        return dump_context(self.session.get_context())
+
+    def get_commit(self) -> str | None:
+        r"""Get commit.
+
+        :param self:
+        :rtype: str | None
+        """
+        commit = self.session.get_commit()
+        return None if commit is None else commit.text
+
+    def get_schema_list(self) -> list[tuple[str, str]]:
+        r"""Get schema list.
+
+        :param self:
+        :rtype: list[tuple[str, str]]
+        """
+        return [
+            (item.schema_id, item.name)
+            for item in self.session.get_schema_list()
+        ]
+
+    def __call__(self, method: str, *params: Any) -> Any:
+        r"""Call a method. librime is called by one thread at a time.
+
+        :param self:
+        :param method:
+        :type method: str
+        :param params:
+        :type params: Any
+        :rtype: Any
+        """
+        if method not in METHODS:
+            raise AttributeError(method)
+        func = getattr(self, method, None) or getattr(self.session, method)
+        with self.lock:
+            return func(*params)
+
+
+@dataclass
+class Server:
+    r"""A server hosting a pool of sessions."""
+
+    path: str = field(default_factory=get_socket_path)
+    factory: Callable[[], SessionBase] = get_session
+    sessions: list[SessionBase] = field(default_factory=list)
+    lock: Lock = field(default_factory=Lock)
+
+    def acquire(self) -> SessionBase:
+        r"""Take a session from the pool, or create one.
+
+        :param self:
+        :rtype: SessionBase
+        """
+        with self.lock:
+            if self.sessions:
+                return self.sessions.pop()
+            return self.factory()
+
+    def release(self, session: SessionBase) -> None:
+        r"""Put a session back to the pool.
+
+        :param self:
+        :param session:
+        :type session: SessionBase
+        :rtype: None
+        """
+        with self.lock:
+            session.clear_composition()
+            self.sessions += [session]
+
+    def handle(self, request: StreamRequestHandler) -> None:
+        r"""Handle a connection until it is closed.
+
+        :param self:
+        :param request:
+        :type request: StreamRequestHandler
+        :rtype: None
+        """
+        session = self.acquire()
+        handler = Handler(session, self.lock)
+        try:
+            while (message := recv(request.rfile)) is not None:
+                try:
+                    response = [0, handler(*message)]
+                except Exception as e:
+                    logger.exception(e)
+                    response = [1, f"{type(e).__name__}: {e}"]
+                send(request.connection, response)
+        finally:
+            self.release(session)
+
+    def create_server(self) -> ThreadingUnixStreamServer:
+        r"""Create a socket server only accessed by the user.
+
+        A stale socket is removed. If a server is listening on the socket,
+        raise ``RuntimeError``. If the path isn't a socket, raise
+        ``FileExistsError``.
+
+        :param self:
+        :rtype: ThreadingUnixStreamServer
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not S_ISSOCK(mode):
+                raise FileExistsError(f"{self.path} is not a socket")
+            with socket(AF_UNIX, SOCK_STREAM) as sock:
+                try:
+                    sock.connect(self.path)
+                except ConnectionRefusedError:
+                    os.remove(self.path)
+                else:
+                    raise RuntimeError(f"a server is running on {self.path}")
+        server = self
+
+        class RequestHandler(StreamRequestHandler):
+            r"""Request handler."""
+
+            def handle(self) -> None:
+                r"""Handle.
+
+                :rtype: None
+                """
+                server.handle(self)
+
+        # create the socket with mode 0600
+        umask = os.umask(0o177)
+        try:
+            socket_server = ThreadingUnixStreamServer(
+                self.path, RequestHandler
+            )
+        finally:
+            os.umask(umask)
+        socket_server.daemon_threads = True
+        return socket_server
+
+    def serve_forever(self) -> None:
+        r"""Serve until interrupted.
+
+        :param self:
+        :rtype: None
+        """
+        with self.create_server() as socket_server:
+            logger.info("serve on %s", self.path)
+            try:
+                socket_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.remove(self.path)
@@ -5,20 +5,30 @@ Wrap rime as OOP APIs.
 Refer <https://github.com/rimeinn/rime.nvim/blob/main/lua/rime/session.lua>
 """
 
+from array import array
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass, field
 
 from . import SchemaListItem
 from .api import API, Traits
 from .ime import Commit, Context
+from .runtime import Runtime, get_runtime
 from .utils import SessionBase
 
 
 @dataclass
 class Session(SessionBase):
-    r"""A session for Rime"""
+    r"""A session for Rime.
 
-    traits: Traits = field(default_factory=Traits)
-    api: API = field(default_factory=API)
+    All sessions share one librime runtime. Creating a session after the
+    first one doesn't initialize librime again.
+
+    A session created when librime is deploying has ``id`` ``0`` until
+    ``is_maintenance_mode()`` finds deployment finished.
+    """
+
+    traits: Traits | None = None
+    runtime: Runtime = field(default_factory=get_runtime)
     id: int = 0
 
     def __post_init__(self):
@@ -26,6 +36,7 @@ class Session(SessionBase):
 
         :param self:
         """
+        self.api: API = self.runtime.acquire(self.traits)
         if self.id == 0:
             self.id = self.api.create_session()
 
@@ -35,7 +46,10 @@ class Session(SessionBase):
         :param self:
         :rtype: None
         """
+        if "api" not in vars(self):
+            return
         self.api.destroy_session(self.id)
+        self.runtime.release()
 
     def process_key(self, keycode: int, mask: int) -> bool:
         r"""Process key.
@@ -49,6 +63,49 @@ class Session(SessionBase):
         """
         return self.api.process_key(self.id, keycode, mask)
 
+    def process_keys(  # type: ignore
+        self, keycodes: "array[int]", masks: "array[int]"
+    ) -> int:
+        r"""Process keys in one native call.
+
+        :param self:
+        :param keycodes: ``array("i")``
+        :type keycodes: array[int]
+        :param masks: ``array("i")``
+        :type masks: array[int]
+        :return: the index of the first unprocessed key, or the number of
+            keys if all keys are processed
+        :rtype: int
+        """
+        return self.api.process_keys(self.id, keycodes, masks)
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode. Keys are not processed when deploying.
+
+        A session cannot be created when deploying, so it is created after
+        deployment.
+
+        :param self:
+        :rtype: bool
+        """
+        if self.api.is_maintenance_mode():
+            return True
+        if self.id == 0:
+            self.id = self.api.create_session()
+        return False
+
+    def simulate(self, sequence: str) -> bool:
+        r"""Simulate a key sequence such as ``"nihao{space}"``.
+
+        librime parses the sequence, no ``Key`` is created.
+
+        :param self:
+        :param sequence:
+        :type sequence: str
+        :rtype: bool
+        """
+        return self.api.simulate_key_sequence(self.id, sequence)
+
     def get_context(self) -> Context | None:
         r"""Get context.
 
@@ -57,6 +114,18 @@ class Session(SessionBase):
         """
         return self.api.get_context(self.id)
 
+    def get_context_view(self) -> AbstractContextManager[Context | None]:
+        r"""Get a lazy view of context.
+
+        It decodes fields only when they are accessed and frees librime's
+        memory when the ``with`` statement exits.
+
+        :param self:
+        :rtype: AbstractContextManager[Context | None]
+        """
+        view = self.api.get_context_view(self.id)
+        return nullcontext() if view is None else view  # type: ignore
+
     def get_commit(self) -> Commit | None:
         r"""Get commit.
 
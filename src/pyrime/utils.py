@@ -2,6 +2,8 @@ r"""Utils
 =========
 """
 
+from collections.abc import Sequence
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 
 from . import SchemaListItem
@@ -24,6 +26,43 @@ class SessionBase:
         """
         return False
 
+    def process_keys(
+        self, keycodes: Sequence[int], masks: Sequence[int]
+    ) -> int:
+        r"""Process keys until a key is not processed.
+
+        :param self:
+        :param keycodes:
+        :type keycodes: Sequence[int]
+        :param masks:
+        :type masks: Sequence[int]
+        :return: the index of the first unprocessed key, or the number of
+            keys if all keys are processed
+        :rtype: int
+        """
+        for i, (keycode, mask) in enumerate(zip(keycodes, masks, strict=True)):
+            if not self.process_key(keycode, mask):
+                return i
+        return len(keycodes)
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode. Keys are not processed when deploying.
+
+        :param self:
+        :rtype: bool
+        """
+        return False
+
+    def simulate(self, sequence: str) -> bool:
+        r"""Simulate a key sequence such as ``"nihao{space}"``.
+
+        :param self:
+        :param sequence:
+        :type sequence: str
+        :rtype: bool
+        """
+        return False
+
     def get_context(self) -> Context | None:
         r"""Get context.
 
@@ -32,6 +71,14 @@ class SessionBase:
         """
         return None
 
+    def get_context_view(self) -> AbstractContextManager[Context | None]:
+        r"""Get a context which can be used in a ``with`` statement.
+
+        :param self:
+        :rtype: AbstractContextManager[Context | None]
+        """
+        return nullcontext(self.get_context())
+
     def get_commit(self) -> Commit | None:
         r"""Get commit.
 
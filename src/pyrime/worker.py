@@ -0,0 +1,84 @@
+r"""Worker
+==========
+
+librime can take hundreds of milliseconds to process a key, such as the
+first key after startup or when the user dictionary is being written.
+``Worker`` calls librime on a dedicated thread, where ``Session`` releases
+the GIL, so the event loop keeps handling keystrokes.
+"""
+
+from asyncio import Future, get_running_loop
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+
+@dataclass
+class Worker:
+    r"""A worker running functions in order on one thread.
+
+    Results are posted back to the running event loop. Without a running
+    event loop, such as in ``gdb``, functions are called synchronously.
+    """
+
+    executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(1, "pyrime")
+    )
+    pending: int = 0
+
+    def submit(
+        self,
+        func: Callable[[], Any],
+        callback: Callable[[Any], object] | None = None,
+    ) -> None:
+        r"""Submit a function. Its result is passed to ``callback`` in the
+        event loop.
+
+        :param self:
+        :param func:
+        :type func: Callable[[], Any]
+        :param callback:
+        :type callback: Callable[[Any], object] | None
+        :rtype: None
+        """
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            result = func()
+            if callback:
+                callback(result)
+            return
+        self.pending += 1
+        future = loop.run_in_executor(self.executor, func)
+        future.add_done_callback(partial(self.done, callback))
+
+    def done(
+        self, callback: Callable[[Any], object] | None, future: Future
+    ) -> None:
+        r"""Pass a result to ``callback``.
+
+        Exceptions are raised in the event loop.
+
+        :param self:
+        :param callback:
+        :type callback: Callable[[Any], object] | None
+        :param future:
+        :type future: Future
+        :rtype: None
+        """
+        self.pending -= 1
+        if future.cancelled():
+            return
+        result = future.result()
+        if callback:
+            callback(result)
+
+    def shutdown(self) -> None:
+        r"""Wait for all submitted functions and stop the thread.
+
+        :param self:
+        :rtype: None
+        """
+        self.executor.shutdown()
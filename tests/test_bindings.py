@@ -0,0 +1,151 @@
+r"""Test key bindings."""
+
+import asyncio
+from dataclasses import dataclass, field
+from threading import Event
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.application.current import create_app_session, set_app
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.key_binding.key_bindings import KeyBindings
+from prompt_toolkit.key_binding.key_processor import KeyPress
+from prompt_toolkit.keys import Keys
+from prompt_toolkit.layout.containers import Window
+from prompt_toolkit.layout.controls import BufferControl
+from prompt_toolkit.layout.layout import Layout
+from prompt_toolkit.output import DummyOutput
+
+from pyrime.ptpython.ime import IME
+from pyrime.ptpython.layout import RimeLayout
+from pyrime.utils import SessionBase
+from pyrime.worker import Worker
+
+
+@dataclass
+class Session(SessionBase):
+    r"""A session recording processed keys."""
+
+    keys: str = ""
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        if mask == 0 and chr(keycode).islower():
+            self.keys += chr(keycode)
+            return True
+        return False
+
+
+@dataclass
+class SlowSession(Session):
+    r"""A session blocking until ``event`` is set."""
+
+    event: Event = field(default_factory=Event)
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        self.event.wait()
+        return super().process_key(keycode, mask)
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_dispatch() -> None:
+        r"""Test characters are sent to rime only when rime is enabled.
+
+        :rtype: None
+        """
+        session = Session()
+        with (
+            create_pipe_input() as input,
+            create_app_session(input=input, output=DummyOutput()),
+        ):
+            buffer = Buffer()
+            app = Application(Layout(Window(BufferControl(buffer))))
+            app.timeoutlen = None
+            with set_app(app):
+                ime = IME(RimeLayout(app), session=session)
+                key_processor = app.key_processor
+                key_processor.feed_multiple([KeyPress("a"), KeyPress("b")])
+                key_processor.process_keys()
+                assert (buffer.text, session.keys) == ("ab", "")
+                ime.is_enabled = True
+                key_processor.feed_multiple([
+                    KeyPress("n"),
+                    KeyPress("I"),
+                    KeyPress(Keys.ControlA),
+                ])
+                key_processor.process_keys()
+                assert (buffer.text, session.keys) == ("abI", "n")
+
+    @staticmethod
+    def test_worker() -> None:
+        r"""Test keys are processed in order when rime is slow.
+
+        :rtype: None
+        """
+        session = SlowSession()
+        key_bindings = KeyBindings()
+
+        @key_bindings.add("c-m")
+        def _(event) -> None:
+            r""".
+
+            :param event:
+            :rtype: None
+            """
+            event.current_buffer.insert_text("\n")
+
+        with (
+            create_pipe_input() as input,
+            create_app_session(input=input, output=DummyOutput()),
+        ):
+            buffer = Buffer()
+            app = Application(
+                Layout(Window(BufferControl(buffer))),
+                key_bindings=key_bindings,
+            )
+            app.timeoutlen = None
+
+            async def main() -> None:
+                r""".
+
+                :rtype: None
+                """
+                ime = IME(RimeLayout(app), session=session, worker=Worker())
+                ime.is_enabled = True
+                key_processor = app.key_processor
+                key_processor.feed_multiple([
+                    KeyPress("n"),
+                    KeyPress(Keys.ControlM),
+                    KeyPress("i"),
+                ])
+                # the event loop isn't blocked by rime
+                key_processor.process_keys()
+                assert ime.worker
+                assert (buffer.text, ime.worker.pending) == ("", 3)
+                session.event.set()
+                while ime.worker.pending:
+                    await asyncio.sleep(0.01)
+                ime.worker.shutdown()
+                # <enter> isn't processed by rime, so it is replayed
+                assert (buffer.text, session.keys) == ("\n", "ni")
+
+            with set_app(app):
+                asyncio.run(main())
@@ -0,0 +1,107 @@
+r"""Test convert."""
+
+import json
+import os
+from dataclasses import dataclass
+
+from pyrime.convert import Converter
+from pyrime.ime import Candidates, Commit, Composition, Context, Menu
+from pyrime.utils import SessionBase
+
+WORDS = {"ni": ("你", "泥"), "hao": ("好", "号")}
+
+
+@dataclass
+class Session(SessionBase):
+    r"""A session knowing a few words."""
+
+    preedit: str = ""
+    commit: str = ""
+
+    def simulate(self, sequence: str) -> bool:
+        r"""Simulate. ``{space}`` commits the first candidate.
+
+        :param sequence:
+        :type sequence: str
+        :rtype: bool
+        """
+        *words, self.preedit = sequence.split("{space}")
+        for word in words:
+            self.commit += WORDS.get(word, (word,))[0]
+        return True
+
+    def get_commit(self) -> Commit | None:
+        r"""Get commit.
+
+        :rtype: Commit | None
+        """
+        commit, self.commit = self.commit, ""
+        return Commit(commit) if commit else None
+
+    def get_context(self) -> Context | None:
+        r"""Get context.
+
+        :rtype: Context | None
+        """
+        texts = WORDS.get(self.preedit, ())
+        length = len(self.preedit)
+        return Context(
+            Composition(length, length, 0, length, self.preedit),
+            Menu(
+                5,
+                0,
+                True,
+                0,
+                len(texts),
+                None,
+                Candidates(texts, (None,) * len(texts)),
+            ),
+        )
+
+    def clear_composition(self) -> None:
+        r"""Clear composition.
+
+        :rtype: None
+        """
+        self.preedit = ""
+
+
+def create_session(user_data_dir: str) -> Session:
+    r"""Create a session.
+
+    :param user_data_dir:
+    :type user_data_dir: str
+    :rtype: Session
+    """
+    assert os.listdir(user_data_dir) == []
+    return Session()
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_convert() -> None:
+        r"""Test the first candidate is output, or the line itself.
+
+        :rtype: None
+        """
+        converter = Converter(create_session, jobs=1)
+        assert list(converter(["ni", "hao", "xx"])) == ["你", "好", "xx"]
+        lines = ["ni{space}", "ni{space}hao", "ni{space}xx"]
+        assert list(converter(lines)) == ["你", "你好", "你xx"]
+        converter.top_k = 2
+        result = json.loads(next(converter(["ni{space}hao"])))
+        assert result["candidates"] == ["你好", "你号"]
+
+    @staticmethod
+    def test_order() -> None:
+        r"""Test the output of many processes keeps the order.
+
+        :rtype: None
+        """
+        lines = ["ni", "hao"] * 50
+        converter = Converter(create_session, top_k=1, jobs=2, chunk_size=3)
+        results = [json.loads(line) for line in converter(lines)]
+        assert [result["input"] for result in results] == lines
+        assert results[1]["candidates"] == ["好"]
@@ -0,0 +1,29 @@
+r"""Test IME."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from pyrime.ime import Candidate, Candidates
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_candidates() -> None:
+        r"""Test candidates behave like a list of ``Candidate``.
+
+        :rtype: None
+        """
+        candidates = Candidates(("我", "为", "玩"), (None, "~", None))
+        assert len(candidates) == 3
+        assert candidates[1] == Candidate("为", "~")
+        assert candidates[1:] == Candidates(("为", "玩"), ("~", None))
+        assert list(candidates) == [
+            Candidate("我", None),
+            Candidate("为", "~"),
+            Candidate("玩", None),
+        ]
+        with pytest.raises(FrozenInstanceError):
+            candidates[0].text = "你"  # type: ignore
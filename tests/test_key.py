@@ -1,5 +1,8 @@
 r"""Test key."""
 
+from dataclasses import FrozenInstanceError
+
+import pytest
 from prompt_toolkit.keys import Keys
 
 from pyrime.key import Key
@@ -18,3 +21,15 @@ class Test:
         key = Key.new(pt_key_name((Keys.ControlCircumflex,)))
         assert key.basic == ord("6")
         assert key.modifier == key.modifier_flag.C
+
+    @staticmethod
+    def test_cache() -> None:
+        r"""Test parsed keys are cached immutable values.
+
+        :rtype: None
+        """
+        key = Key.new("<c-a>")
+        assert Key.new("<c-a>") is key
+        assert {key: 1}[Key.new("<C-a>")] == 1
+        with pytest.raises(FrozenInstanceError):
+            key.basic = ord("b")  # type: ignore
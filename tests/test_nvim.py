@@ -0,0 +1,274 @@
+r"""Test nvim."""
+
+from dataclasses import dataclass, field
+
+import pytest
+
+pytest.importorskip("pynvim")
+
+from pyrime.ime import (  # noqa: E402
+    Candidates,
+    Commit,
+    Composition,
+    Context,
+    Menu,
+)
+from pyrime.key import Key  # noqa: E402
+from pyrime.nvim.keymap import Keymap  # noqa: E402
+from pyrime.nvim.rime import DONE, GET_BUFFERS, Rime  # noqa: E402
+from pyrime.nvim.win import Win  # noqa: E402
+from pyrime.utils import SessionBase  # noqa: E402
+
+WIN_ID = 1000
+
+
+BACKSPACE = Key.new("<bs>").basic
+
+
+@dataclass
+class Session(SessionBase):
+    r"""A session composing lower letters. ``<space>`` commits them."""
+
+    preedit: str = ""
+    commit: str = ""
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        if mask != 0:
+            return False
+        if chr(keycode).islower():
+            self.preedit += chr(keycode)
+            return True
+        if self.preedit == "":
+            return False
+        if keycode == BACKSPACE:
+            self.preedit = self.preedit[:-1]
+        elif keycode == ord(" "):
+            self.commit, self.preedit = self.preedit.upper(), ""
+        return True
+
+    def get_context(self) -> Context | None:
+        r"""Get context.
+
+        :rtype: Context | None
+        """
+        length = len(self.preedit)
+        texts = (self.preedit.upper(),) if self.preedit else ()
+        return Context(
+            Composition(length, length, 0, length, self.preedit),
+            Menu(5, 0, True, 0, len(texts), None, Candidates(texts, (None,))),
+        )
+
+    def get_commit(self) -> Commit | None:
+        r"""Get commit.
+
+        :rtype: Commit | None
+        """
+        if not self.commit:
+            return None
+        commit, self.commit = self.commit, ""
+        return Commit(commit)
+
+
+@dataclass
+class Api:
+    r"""A fake ``RemoteApi`` recording calls."""
+
+    calls: list[list] = field(default_factory=list)
+    # buffers whose b:iminsert is true
+    enabled: list[int] = field(default_factory=list)
+    # the lhs of keymaps failing to change
+    failed: list[str] = field(default_factory=list)
+
+    def __getattr__(self, name: str):
+        r"""Get a request recording its call.
+
+        :param name:
+        :type name: str
+        """
+
+        def request(*args: object) -> int:
+            r"""Record a call.
+
+            :param args:
+            :type args: object
+            :rtype: int
+            """
+            self.calls.append([f"nvim_{name}", list(args)])
+            return 1
+
+        return request
+
+    def exec_lua(self, code: str, args: list) -> list | None:
+        r"""Record Lua. The current buffer is ``1``.
+
+        :param code:
+        :type code: str
+        :param args:
+        :type args: list
+        :rtype: list | None
+        """
+        self.calls.append(["nvim_exec_lua", [code, args]])
+        if code == GET_BUFFERS:
+            return [1, self.enabled]
+        return self.failed
+
+    def call_atomic(self, calls: list[list]) -> list:
+        r"""Record calls.
+
+        :param calls:
+        :type calls: list[list]
+        :rtype: list
+        """
+        self.calls += calls
+        return [
+            [
+                self.failed if name == "nvim_exec_lua" else WIN_ID
+                for name, _ in calls
+            ],
+            None,
+        ]
+
+
+@dataclass
+class Nvim:
+    r"""A fake ``Nvim``."""
+
+    api: Api = field(default_factory=Api)
+    channel_id: int = 1
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_win() -> None:
+        r"""Test only changed lines are sent with the window in one request.
+
+        :rtype: None
+        """
+        api = Api()
+        win = Win(api)  # type: ignore
+        api.calls.clear()
+        win.update(("a", "b", "c"))
+        # replace the empty line of a new buffer
+        assert api.calls[0] == [
+            "nvim_buf_set_lines",
+            [1, 0, 1, False, ["a", "b", "c"]],
+        ]
+        assert api.calls[1][0] == "nvim_open_win"
+        assert win.win_id == WIN_ID
+        api.calls.clear()
+        win.update(("a", "c"))
+        assert api.calls[0] == ["nvim_buf_set_lines", [1, 1, 2, False, []]]
+        assert api.calls[1][0] == "nvim_win_set_config"
+        api.calls.clear()
+        win.update(("a", "c"), 2)
+        assert [call[0] for call in api.calls] == ["nvim_win_set_config"]
+        win.closed(WIN_ID)
+        assert not win.is_valid
+        api.calls.clear()
+        win.update(("a", "c"))
+        assert [call[0] for call in api.calls] == ["nvim_open_win"]
+        api.calls.clear()
+        win.update()
+        assert api.calls == [["nvim_win_close", [WIN_ID, False]]]
+        assert not win.has_preedit
+
+    @staticmethod
+    def test_buffers() -> None:
+        r"""Test enabled buffers are tracked without requests.
+
+        :rtype: None
+        """
+        api = Api(enabled=[2])
+        rime = Rime(SessionBase(), vim=Nvim(api))  # type: ignore
+        # seeded from b:iminsert
+        assert rime.buffers == {2}
+        assert not rime.is_enabled
+        rime.buf_enter(2)
+        api.calls.clear()
+        assert rime.is_enabled
+        assert api.calls == []
+        rime.is_enabled = False
+        assert ["nvim_buf_set_var", [2, "iminsert", False]] in api.calls
+        rime.buf_enter(1)
+        rime.is_enabled = True
+        rime.buf_delete(1)
+        assert rime.buffers == set()
+
+    @staticmethod
+    def test_exe() -> None:
+        r"""Test keys are responded in one request.
+
+        :rtype: None
+        """
+        api = Api(enabled=[1])
+        rime = Rime(Session(), vim=Nvim(api))  # type: ignore
+
+        def exe(*keys: str) -> list[list]:
+            r"""Process keys and get the calls of the response.
+
+            :param keys:
+            :type keys: str
+            :rtype: list[list]
+            """
+            api.calls.clear()
+            rime.exe(list(keys))
+            return api.calls
+
+        # not parsed by Key
+        calls = exe("\t")
+        assert calls == [["nvim_exec_lua", [DONE, ["\t", ""]]]]
+        calls = exe("n", "i", "<BS>")
+        assert calls[0] == ["nvim_exec_lua", [DONE, ["", ""]]]
+        # special keymaps are set when composing
+        assert rime.keymap.maps.keys() >= {"<BS>"}
+        assert rime.win.lines[0] == "n|"
+        calls = exe(" ", ",", "<BS>")
+        # <BS> is fed back after the composition is committed
+        assert calls[0] == ["nvim_exec_lua", [DONE, ["N,", "<BS>"]]]
+        assert "<BS>" not in rime.keymap.maps
+        assert calls[-1][0] == "nvim_win_close"
+
+        def fail(keycode: int, mask: int) -> bool:
+            r"""Fail.
+
+            :param keycode:
+            :type keycode: int
+            :param mask:
+            :type mask: int
+            :rtype: bool
+            """
+            raise RuntimeError
+
+        rime.session.process_key = fail  # type: ignore
+        # the Lua shim isn't blocked by an error
+        with pytest.raises(RuntimeError):
+            exe("n")
+        assert api.calls[0] == ["nvim_exec_lua", [DONE, ["", ""]]]
+
+    @staticmethod
+    def test_keymap() -> None:
+        r"""Test keymaps failing to change are tracked.
+
+        :rtype: None
+        """
+        api = Api()
+        keymap = Keymap(api, special=("<BS>", "<CR>"))  # type: ignore
+        api.failed = ["<CR>"]
+        keymap.set_special(lambda lhs: lhs)
+        assert keymap.maps == {"<BS>": "<BS>"}
+        api.failed = []
+        keymap.set_special(lambda lhs: lhs)
+        assert keymap.maps.keys() == {"<BS>", "<CR>"}
+        api.failed = ["<BS>"]
+        keymap.set_special(None)
+        assert keymap.maps.keys() == {"<BS>"}
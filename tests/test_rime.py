@@ -0,0 +1,103 @@
+r"""Test rime."""
+
+from dataclasses import dataclass
+
+from pyrime.key import Key
+from pyrime.rime import LazySession, RimeBase
+from pyrime.utils import SessionBase
+
+
+@dataclass
+class Session(SessionBase):
+    r"""A session only processing lower letters."""
+
+    preedit: str = ""
+    deploying: bool = False
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        if mask == 0 and chr(keycode).islower():
+            self.preedit += chr(keycode)
+            return True
+        return False
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode.
+
+        :rtype: bool
+        """
+        return self.deploying
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_process_keys() -> None:
+        r"""Test process keys until the first unprocessed key.
+
+        :rtype: None
+        """
+        session = Session()
+        assert session.process_keys(b"niH", (0, 0, 0)) == 2
+        assert session.preedit == "ni"
+        assert session.process_keys(b"hao", (0, 0, 0)) == 3
+        assert session.preedit == "nihao"
+
+    @staticmethod
+    def test_draw() -> None:
+        r"""Test draw returns the first unprocessed key.
+
+        :rtype: None
+        """
+        rime = RimeBase(Session())
+        keys = tuple(Key.new(char) for char in "ni,hao")
+        assert rime.draw(*keys) == (",", (), 0)
+        # a special key not processed isn't inserted
+        assert rime.draw(Key.new("<bs>")) == ("", (), 0)
+        assert rime.session.preedit == "ni"
+
+    @staticmethod
+    def test_deploying() -> None:
+        r"""Test keys are passed through when deploying.
+
+        :rtype: None
+        """
+        rime = RimeBase(Session(deploying=True))
+        assert rime.draw(*map(Key.new, "ni")) == ("ni", (), 0)
+        keys = map(Key.new, ("<bs>", "<c-a>", "a"))
+        assert rime.draw(*keys) == ("a", (), 0)
+        assert rime.draw(*map(Key.new, "hao")) == ("hao", (), 0)
+        assert rime.session.preedit == ""
+
+    @staticmethod
+    def test_lazy_session() -> None:
+        r"""Test session is created when it is started.
+
+        :rtype: None
+        """
+        sessions = []
+
+        def create() -> Session:
+            r"""Create a session.
+
+            :rtype: Session
+            """
+            sessions.append(Session())
+            return sessions[-1]
+
+        lazy_session = LazySession(create)
+        rime = RimeBase(lazy_session)
+        assert sessions == []
+        lazy_session.start()
+        rime.is_enabled = True
+        assert rime.session is sessions[0]
+        assert rime.draw(*map(Key.new, "ni")) == ("", (), 0)
+        assert sessions[0].preedit == "ni"
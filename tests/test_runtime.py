@@ -0,0 +1,123 @@
+r"""Test runtime."""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import pytest
+
+from pyrime.runtime import Runtime
+
+
+@dataclass
+class API:
+    r"""A fake API recording calls."""
+
+    calls: list[str] = field(default_factory=list)
+    handler: Callable[[int, str, str], object] | None = None
+
+    def setup(self, traits: object) -> None:
+        r"""Setup.
+
+        :param traits:
+        :type traits: object
+        :rtype: None
+        """
+        self.calls += ["setup"]
+
+    def initialize(self, traits: object) -> None:
+        r"""Initialize.
+
+        :param traits:
+        :type traits: object
+        :rtype: None
+        """
+        self.calls += ["initialize"]
+
+    def finalize(self) -> None:
+        r"""Finalize.
+
+        :rtype: None
+        """
+        self.calls += ["finalize"]
+
+    def set_notification_handler(
+        self, handler: Callable[[int, str, str], object] | None
+    ) -> None:
+        r"""Set notification handler.
+
+        :param handler:
+        :type handler: Callable[[int, str, str], object] | None
+        :rtype: None
+        """
+        self.handler = handler
+
+    def start_maintenance(self, full_check: bool) -> bool:
+        r"""Notify deployment starts.
+
+        :param full_check:
+        :type full_check: bool
+        :rtype: bool
+        """
+        if self.handler:
+            self.handler(0, "deploy", "start")
+        return True
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode.
+
+        :rtype: bool
+        """
+        return False
+
+    def join_maintenance_thread(self) -> None:
+        r"""Notify deployment succeeds.
+
+        :rtype: None
+        """
+        if self.handler:
+            self.handler(0, "deploy", "success")
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_runtime() -> None:
+        r"""Test librime is initialized once and finalized once.
+
+        :rtype: None
+        """
+        api = API()
+        runtime = Runtime(object(), api)  # type: ignore
+        runtime.acquire()
+        runtime.acquire()
+        assert api.calls == ["setup", "initialize"]
+        runtime.release()
+        assert api.calls == ["setup", "initialize"]
+        runtime.release()
+        runtime.release()
+        assert api.calls == ["setup", "initialize", "finalize"]
+        runtime.acquire()
+        assert api.calls[3:] == ["setup", "initialize"]
+
+    @staticmethod
+    def test_deploy() -> None:
+        r"""Test deployment status is updated by notifications.
+
+        :rtype: None
+        """
+        api = API()
+        runtime = Runtime(object(), api)  # type: ignore
+        with pytest.raises(RuntimeError):
+            runtime.deploy()
+        runtime.acquire()
+        notifications = []
+        runtime.handlers += [lambda *args: notifications.append(args)]
+        assert runtime.deploy()
+        assert runtime.status == "start"
+        assert asyncio.run(runtime.wait()) == "success"
+        assert notifications == [
+            (0, "deploy", "start"),
+            (0, "deploy", "success"),
+        ]
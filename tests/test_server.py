@@ -0,0 +1,148 @@
+r"""Test server."""
+
+import os
+from dataclasses import dataclass
+from threading import Thread
+from time import sleep
+
+import pytest
+
+from pyrime.client import RemoteSession
+from pyrime.ime import Candidates, Composition, Context, Menu
+from pyrime.key import Key
+from pyrime.rime import RimeBase
+from pyrime.server import Server
+from pyrime.utils import SessionBase
+
+
+@dataclass
+class Session(SessionBase):
+    r"""A session only processing lower letters."""
+
+    preedit: str = ""
+    deploying: bool = False
+
+    def is_maintenance_mode(self) -> bool:
+        r"""Is maintenance mode.
+
+        :rtype: bool
+        """
+        return self.deploying
+
+    def process_key(self, keycode: int, mask: int) -> bool:
+        r"""Process key.
+
+        :param keycode:
+        :type keycode: int
+        :param mask:
+        :type mask: int
+        :rtype: bool
+        """
+        if mask == 0 and chr(keycode).islower():
+            self.preedit += chr(keycode)
+            return True
+        return False
+
+    def get_context(self) -> Context | None:
+        r"""Get context.
+
+        :rtype: Context | None
+        """
+        length = len(self.preedit)
+        return Context(
+            Composition(length, length, 0, length, self.preedit),
+            Menu(5, 0, True, 0, 1, None, Candidates(("你",), (None,))),
+        )
+
+    def clear_composition(self) -> None:
+        r"""Clear composition.
+
+        :rtype: None
+        """
+        self.preedit = ""
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    def test_server(tmp_path) -> None:
+        r"""Test a remote session works with ``RimeBase`` in one round trip
+        per key.
+
+        :param tmp_path:
+        :rtype: None
+        """
+        server = Server(os.path.join(tmp_path, "pyrime.sock"), Session)
+        socket_server = server.create_server()
+        thread = Thread(target=socket_server.serve_forever)
+        thread.start()
+        try:
+            assert os.stat(server.path).st_mode & 0o777 == 0o600
+            session = RemoteSession(server.path)
+            rime = RimeBase(session)
+            _, lines, _ = rime.draw(*map(Key.new, "ni"))
+            assert lines[0] == "ni|"
+            assert session.get_context() == Session("ni").get_context()
+            assert list(session.latencies) == ["process_keys_context"]
+            assert rime.draw(*map(Key.new, ",")) == (",", (), 0)
+            session.close()
+            for _ in range(100):
+                if server.sessions:
+                    break
+                sleep(0.01)
+            assert len(server.sessions) == 1
+            session = RemoteSession(server.path)
+            # the session is cleared and reused
+            assert session.get_context() == Session().get_context()
+            assert len(server.sessions) == 0
+            session.close()
+            # don't steal the socket of a running server
+            with pytest.raises(RuntimeError):
+                Server(server.path).create_server()
+            # don't remove a regular file
+            path = os.path.join(tmp_path, "notes.txt")
+            with open(path, "w") as f:
+                f.write("notes")
+            with pytest.raises(FileExistsError):
+                Server(path).create_server()
+            assert os.path.isfile(path)
+        finally:
+            socket_server.shutdown()
+            socket_server.server_close()
+            thread.join()
+
+    @staticmethod
+    def test_deploying(tmp_path) -> None:
+        r"""Test keys are processed again after the server deploys.
+
+        :param tmp_path:
+        :rtype: None
+        """
+        sessions = []
+
+        def create() -> Session:
+            r"""Create a deploying session.
+
+            :rtype: Session
+            """
+            sessions.append(Session(deploying=True))
+            return sessions[-1]
+
+        server = Server(os.path.join(tmp_path, "pyrime.sock"), create)
+        socket_server = server.create_server()
+        thread = Thread(target=socket_server.serve_forever)
+        thread.start()
+        try:
+            session = RemoteSession(server.path)
+            rime = RimeBase(session)
+            session.process_keys((), ())
+            assert rime.draw(*map(Key.new, "b")) == ("b", (), 0)
+            sessions[0].deploying = False
+            _, lines, _ = rime.draw(*map(Key.new, "b"))
+            assert lines[0] == "b|"
+            session.close()
+        finally:
+            socket_server.shutdown()
+            socket_server.server_close()
+            thread.join()
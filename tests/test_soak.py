@@ -0,0 +1,58 @@
+r"""Test memory doesn't grow while typing."""
+
+import os
+import sys
+from itertools import cycle, islice
+
+import pytest
+
+from pyrime.key import Key
+from pyrime.rime import RimeBase
+
+resource = pytest.importorskip("resource")
+# opt in by setting the number of keystrokes, such as 1000000
+NUMBER = int(os.getenv("PYRIME_SOAK_KEYS", "0"))
+# Linux reports KiB, macOS reports bytes
+UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def get_max_rss() -> int:
+    r"""Get maximum resident set size in bytes.
+
+    :rtype: int
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * UNIT
+
+
+class Test:
+    r"""Test."""
+
+    @staticmethod
+    @pytest.mark.skipif(NUMBER == 0, reason="PYRIME_SOAK_KEYS is not set")
+    def test_soak(tmp_path) -> None:
+        r"""Test RSS stays flat after many keystrokes.
+
+        The user dictionary is written to a temporary directory.
+
+        :param tmp_path:
+        :rtype: None
+        """
+        try:
+            from pyrime.api import Traits
+            from pyrime.session import Session
+
+            session = Session(
+                Traits(user_data_dir=str(tmp_path), log_dir=str(tmp_path))
+            )
+        except (ImportError, NotADirectoryError) as e:
+            pytest.skip(str(e))
+        if session.runtime.deploy():
+            session.runtime.join()
+        rime = RimeBase(session)
+        keys = cycle(Key.new(char) for char in "nihao ")
+        for key in islice(keys, NUMBER // 100):
+            rime.draw(key)
+        rss = get_max_rss()
+        for key in islice(keys, NUMBER):
+            rime.draw(key)
+        assert get_max_rss() - rss < 16 * 1024 * 1024
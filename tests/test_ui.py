@@ -1,7 +1,8 @@
 r"""Test draw UI."""
 
-from pyrime.ime import Candidate, Composition, Context, Menu
+from pyrime.ime import Candidate, Candidates, Composition, Context, Menu
 from pyrime.ime.ui.horizontal import HorizontalUI
+from pyrime.ime.ui.vertical import VerticalUI
 
 
 class Test:
@@ -45,3 +46,38 @@ class Test:
         ui = HorizontalUI()
         lines = ("w|", "[① 我]② 为 ③ 玩 ④ 问 ⑤ 无 ⑥ 万 ⑦ 完 ⑧ 网 ⑨ 王 ⓪ 外 |>")
         assert ui.draw(context) == (lines, 0)
+
+    @staticmethod
+    def test_render() -> None:
+        r"""Test render the same context again hits the cache.
+
+        :rtype: None
+        """
+        context = Context(
+            Composition(1, 1, 0, 1, "w"),
+            Menu(10, 0, True, 0, 1, None, [Candidate("我", None)]),
+        )
+        ui = HorizontalUI()
+        assert ui.render(context) == ui.draw(context)
+        assert ui.render(context) == ui.draw(context)
+        assert (ui.hits, ui.misses) == (1, 1)
+
+    @staticmethod
+    def test_fragments() -> None:
+        r"""Test the highlighted candidate is styled.
+
+        :rtype: None
+        """
+        context = Context(
+            Composition(1, 1, 0, 1, "w"),
+            Menu(10, 0, True, 1, 2, None, Candidates(("我", "为"), ("", ""))),
+        )
+        (preedit, _, line), _ = VerticalUI().draw(context)
+        assert preedit.fragments[1:3] == [
+            ("class:rime.preedit", "w"),
+            ("class:rime.cursor", "|"),
+        ]
+        assert line == "[② 为]"
+        assert ("class:rime.candidate class:rime.highlighted", " 为") in (
+            line.fragments
+        )